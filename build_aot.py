@@ -0,0 +1,37 @@
+"""This file will compile the Erlang B and Erlang C kernels ahead of time.
+
+If the compiled module exists, queuesim.analytic uses it instead of
+compiling the kernels via Numba at runtime. So there is no JIT warm-up
+on the first call. If this file is not used, nothing changes.
+
+Usage: python build_aot.py
+
+See: https://numba.readthedocs.io/en/stable/user/pycc.html
+"""
+
+import os
+from numba import njit
+from numba.pycc import CC
+from queuesim.analytic.kernels import _erlang_b_kernel, _erlang_c_kernel
+
+cc = CC('qsanalytic_aot')
+cc.output_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'queuesim', 'analytic')
+
+erlang_b_row = njit(_erlang_b_kernel)
+erlang_c_row = njit(_erlang_c_kernel)
+
+
+@cc.export('erlang_b', 'void(f8[:], i8[:], f8[:], f8[:])')
+def erlang_b(a, c, p_blocked, EN):
+    for i in range(a.shape[0]):
+        erlang_b_row(a[i], c[i], p_blocked[i:i + 1], EN[i:i + 1])
+
+
+@cc.export('erlang_c', 'void(f8[:], i8[:], f8[:])')
+def erlang_c(a, c, P1):
+    for i in range(a.shape[0]):
+        erlang_c_row(a[i], c[i], P1[i:i + 1])
+
+
+if __name__ == "__main__":
+    cc.compile()
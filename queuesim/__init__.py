@@ -1,8 +1,8 @@
 """Discrete-event simulation package."""
 
 from .descore import Simulator
-from .tools import SimProcess, run_parallel, get_multi_run_info
-from .graph import build_graph
+from .tools import SimProcess, run_parallel, run_parallel_columns, get_pool, get_multi_run_info
+from .graph import build_graph, graph_layout
 
 
 __title__ = "queuesim"
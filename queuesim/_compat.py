@@ -0,0 +1,32 @@
+"""Optional NumPy support shared by the simulation modules."""
+
+from typing import Any
+import platform
+
+
+__title__ = "queuesim"
+__version__ = "1.0"
+__author__ = "Alexander Herzog"
+__email__ = "alexander.herzog@tu-clausthal.de"
+__copyright__ = """
+Copyright 2022 Alexander Herzog
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+__license__ = "Apache 2.0"
+
+
+np: Any = None
+if platform.python_implementation() != "PyPy": import numpy as np  # NumPy is not used on PyPy (the plain Python code paths are faster there)
+
+USE_NUMPY: bool = np is not None  # Use the NumPy code paths in random_dist, statistics and tools?
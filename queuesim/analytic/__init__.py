@@ -1,9 +1,9 @@
 """Erlang B, Erlang C and Allen Cunneen calculation package."""
 
-from .erlang_b import erlang_b, erlang_b_table
-from .erlang_c import erlang_c, erlang_c_table
-from .erlang_c_ext import erlang_c_ext, erlang_c_ext_table
-from .ac_approx import ac_approx, ac_approx_table
+from .erlang_b import erlang_b, erlang_b_table, erlang_b_table_vec, erlang_b_vec
+from .erlang_c import erlang_c, erlang_c_table, erlang_c_table_vec, erlang_c_vec
+from .erlang_c_ext import erlang_c_ext, erlang_c_ext_table, erlang_c_ext_table_vec, erlang_c_ext_vec
+from .ac_approx import ac_approx, ac_approx_table, ac_approx_table_vec, ac_approx_vec
 
 
 __title__ = "queuesim"
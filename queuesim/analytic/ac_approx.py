@@ -1,8 +1,8 @@
 """Allen Cunneen approximation formula (for a GI/G/c system)"""
 
-from math import sqrt
+import numpy as np
 import pandas as pd
-from queuesim.analytic import erlang_c
+from .erlang_c import erlang_c_vec, _erlang_c_metrics
 
 
 __title__ = "queuesim"
@@ -46,7 +46,16 @@ class ac_approx:
         self.__c: int = max(1, c)
         self.__scv_i: float = max(0, scv_i)
         self.__scv_s: float = max(0, scv_s)
-        self.__erlang_enq = erlang_c(self.__l, self.__mu, self.__c).ENQ
+
+        # Allen Cunneen: Erlang C waiting times scaled by (SCV[I] + SCV[S]) / 2
+        # (the Erlang C values are already 0 for unstable systems, so the stable factor replaces the a >= c branches)
+        factor: float = (self.__scv_i + self.__scv_s) / 2
+        stable: float = float(self.__a < self.__c)
+        _, _, erlang_ENQ, _, erlang_EW, _ = _erlang_c_metrics(self.__l, self.__mu, self.__c)
+        self.__ENQ: float = erlang_ENQ * factor
+        self.__EN: float = stable * (self.__ENQ + self.__a)
+        self.__EW: float = erlang_EW * factor
+        self.__EV: float = stable * (self.__EW + (1 / self.__mu if self.__mu > 0 else 0))
 
     @property
     def l(self) -> float:
@@ -118,8 +127,7 @@ class ac_approx:
         Returns:
             float: Mean number of clients in the queue E[N_Q]
         """
-        if self.__a >= self.__c: return 0
-        return self.__erlang_enq * (self.__scv_i + self.__scv_s) / 2
+        return self.__ENQ
 
     @property
     def EN(self) -> float:
@@ -128,8 +136,7 @@ class ac_approx:
         Returns:
             float: Mean number of clients in the system (waiting and in service process) E[N]
         """
-        if self.__a >= self.__c: return 0
-        return self.__erlang_enq * (self.__scv_i + self.__scv_s) / 2 + self.__a
+        return self.__EN
 
     @property
     def EW(self) -> float:
@@ -138,8 +145,7 @@ class ac_approx:
         Returns:
             float: Mean waiting time E[W]
         """
-        if self.__a >= self.__c: return 0
-        return self.__erlang_enq * 1 / self.__l * (self.__scv_i + self.__scv_s) / 2
+        return self.__EW
 
     @property
     def EV(self) -> float:
@@ -148,8 +154,7 @@ class ac_approx:
         Returns:
             float: Mean residence time ( = waiting time + service time) E[V]
         """
-        if self.__a >= self.__c: return 0
-        return self.__erlang_enq / self.__l * (self.__scv_i + self.__scv_s) / 2 + 1 / self.__mu
+        return self.__EV
 
 
 def ac_approx_table(parameters: list) -> pd.DataFrame:
@@ -159,24 +164,50 @@ def ac_approx_table(parameters: list) -> pd.DataFrame:
         parameters (list[tuple[float, float, int, float, float]]): List of tuples containing the values for lambda, mu, c, SCV[I] and SCV[S] each
 
     Returns:
-        pd.DataFrame: Allen Cunneen approximation results table
+        pd.DataFrame: Allen Cunneen approximation results table (column c is int64, all other columns are float64)
+    """
+    parameters = np.asarray(parameters, dtype=np.float64).reshape(-1, 5)
+    return ac_approx_table_vec(parameters[:, 0], parameters[:, 1], parameters[:, 2], parameters[:, 3], parameters[:, 4])
+
+
+def ac_approx_vec(l: np.ndarray, mu: np.ndarray, c: np.ndarray, scv_i: np.ndarray, scv_s: np.ndarray) -> dict:
+    """Calculates the Allen Cunneen approximation results for multiple parameter sets at once
+
+    Args:
+        l (np.ndarray): Arrival rates (lambda); scalars are broadcasted
+        mu (np.ndarray): Service rates (mu); scalars are broadcasted
+        c (np.ndarray): Numbers of operators; scalars are broadcasted
+        scv_i (np.ndarray): Squared coefficients of variation of the inter-arrival times; scalars are broadcasted
+        scv_s (np.ndarray): Squared coefficients of variation of the service times; scalars are broadcasted
+
+    Returns:
+        dict: Allen Cunneen approximation results as NumPy arrays (same keys as the columns of ac_approx_table_vec)
+    """
+    l, mu, c, scv_i, scv_s = np.broadcast_arrays(l, mu, c, np.maximum(0, np.asarray(scv_i, dtype=np.float64)), np.maximum(0, np.asarray(scv_s, dtype=np.float64)))
+    erl = erlang_c_vec(l, mu, c)
+    scv_i, scv_s = np.array(scv_i, ndmin=1), np.array(scv_s, ndmin=1)  # Own contiguous copies of the broadcasted inputs, so the DataFrame can use them without copying
+    l, mu, a, c = erl['lambda'], erl['mu'], erl['a'], erl['c']
+    stable = a < c
+    factor = (scv_i + scv_s) / 2
+
+    ENQ = erl['E[N_Q]'] * factor
+    EW = np.divide(ENQ, l, out=np.zeros(len(l)), where=stable)
+    EV = np.where(stable, EW + np.divide(1, mu, out=np.zeros(len(mu)), where=mu > 0), 0)
+
+    return {'lambda': l, 'mu': mu, 'a': a, 'c': c, 'rho': a / c, 'CV[I]': np.sqrt(scv_i), 'CV[S]': np.sqrt(scv_s), 'SCV[I]': scv_i, 'SCV[S]': scv_s, 'E[N_Q]': ENQ, 'E[N]': np.where(stable, ENQ + a, 0), 'E[W]': EW, 'E[V]': EV}
+
+
+def ac_approx_table_vec(l: np.ndarray, mu: np.ndarray, c: np.ndarray, scv_i: np.ndarray, scv_s: np.ndarray) -> pd.DataFrame:
+    """Calculates the Allen Cunneen approximation results for multiple parameter sets at once (vectorized version of ac_approx_table)
+
+    Args:
+        l (np.ndarray): Arrival rates (lambda); scalars are broadcasted
+        mu (np.ndarray): Service rates (mu); scalars are broadcasted
+        c (np.ndarray): Numbers of operators; scalars are broadcasted
+        scv_i (np.ndarray): Squared coefficients of variation of the inter-arrival times; scalars are broadcasted
+        scv_s (np.ndarray): Squared coefficients of variation of the service times; scalars are broadcasted
+
+    Returns:
+        pd.DataFrame: Allen Cunneen approximation results table (column c is int64, all other columns are float64)
     """
-    l, mu, a, c, rho, cv_i, cv_s, scv_i, scv_s, ENQ, EN, EW, EV = [], [], [], [], [], [], [], [], [], [], [], [], []
-
-    for parameter in parameters:
-        ac = ac_approx(parameter[0], parameter[1], parameter[2], parameter[3], parameter[4])
-        l.append(ac.l)
-        mu.append(ac.mu)
-        a.append(ac.a)
-        c.append(ac.c)
-        rho.append(ac.rho)
-        cv_i.append(sqrt(ac.scv_i))
-        cv_s.append(sqrt(ac.scv_s))
-        scv_i.append(ac.scv_i)
-        scv_s.append(ac.scv_s)
-        ENQ.append(ac.ENQ)
-        EN.append(ac.EN)
-        EW.append(ac.EW)
-        EV.append(ac.EV)
-
-    return pd.DataFrame({'lambda': l, 'mu': mu, 'a': a, 'c': c, 'rho': rho, 'CV[I]': cv_i, 'CV[S]': cv_s, 'SCV[I]': scv_i, 'SCV[S]': scv_s, 'E[N_Q]': ENQ, 'E[N]': EN, 'E[W]': EW, 'E[V]': EV})
+    return pd.DataFrame(ac_approx_vec(l, mu, c, scv_i, scv_s), copy=False)
@@ -1,8 +1,12 @@
 """Erlang B formula (for a M/M/c/c system)"""
 
 from typing import Optional
+from functools import lru_cache
+from math import fsum
+import numpy as np
 import pandas as pd
-from .tools import power_factorial
+from .tools import power_factorial_relative
+from .kernels import erlang_b_kernel
 
 
 __title__ = "queuesim"
@@ -27,6 +31,23 @@ limitations under the License.
 __license__ = "Apache 2.0"
 
 
+@lru_cache(maxsize=4096)
+def _erlang_b_EN_p_blocked(a: float, c: int) -> tuple:
+    """Calculates E[N] and P(N = c) in one pass over the terms a^n/n! (cached, since the same parameters are often used repeatedly).
+
+    Args:
+        a (float): Workload ( = lambda/mu)
+        c (int): Number of operators
+
+    Returns:
+        tuple: E[N] and P(N = c)
+    """
+    terms: list = power_factorial_relative(a, c)  # Relative to the largest term, since a^n/n! overflows for large values of a (only the ratios are needed)
+    nominator: float = fsum(terms)  # Exactly rounded sum, the terms span many orders of magnitude for large values of a and c
+    weighted: float = fsum(n * term for n, term in enumerate(terms))
+    return weighted / nominator, terms[-1] / nominator
+
+
 class erlang_b:
     """Erlang B formula (for a M/M/c/c system)"""
 
@@ -42,6 +63,9 @@ class erlang_b:
         self.__p_blocked: Optional[float] = None
         self.__EN: Optional[float] = None
 
+    def __calc(self) -> None:
+        self.__EN, self.__p_blocked = _erlang_b_EN_p_blocked(self.__a, self.__c)
+
     @property
     def a(self) -> float:
         """Workload ( = lambda/mu)
@@ -71,9 +95,7 @@ class erlang_b:
 
     @property
     def EN(self) -> float:
-        if self.__EN is None:
-            nominator: float = sum([power_factorial(self.__a, n) for n in range(self.__c + 1)])
-            self.__EN = sum([power_factorial(self.__a, n) * n for n in range(self.__c + 1)]) / nominator
+        if self.__EN is None: self.__calc()
         return self.__EN
 
     @property
@@ -92,9 +114,7 @@ class erlang_b:
         Returns:
             float: P(N = c)
         """
-        if self.__p_blocked is None:
-            nominator: float = sum([power_factorial(self.__a, n) for n in range(self.__c + 1)])
-            self.__p_blocked = power_factorial(self.__a, self.__c) / nominator
+        if self.__p_blocked is None: self.__calc()
         return self.__p_blocked
 
 
@@ -105,17 +125,46 @@ def erlang_b_table(parameters: list) -> pd.DataFrame:
         parameters (list[tuple[float, int]]): List of tuples containing the values for a and c each
 
     Returns:
-        pd.DataFrame: Erlang B results table
+        pd.DataFrame: Erlang B results table (column c is int64, all other columns are float64)
+    """
+    parameters = np.asarray(parameters, dtype=np.float64).reshape(-1, 2)
+    return erlang_b_table_vec(parameters[:, 0], parameters[:, 1])
+
+
+def erlang_b_vec(a: np.ndarray, c: np.ndarray) -> dict:
+    """Calculates the Erlang B results for multiple parameter sets at once
+
+    Args:
+        a (np.ndarray): Workloads ( = lambda/mu); scalars are broadcasted
+        c (np.ndarray): Numbers of operators; scalars are broadcasted
+
+    Returns:
+        dict: Erlang B results as NumPy arrays (same keys as the columns of erlang_b_table_vec)
+    """
+    a, c = np.broadcast_arrays(np.maximum(0, np.asarray(a, dtype=np.float64)), np.maximum(1, np.asarray(c, dtype=np.int64)))
+    a, c = np.array(a, ndmin=1), np.array(c, ndmin=1)  # Own contiguous copies of the broadcasted inputs, so the DataFrame can use them without copying
+
+    if erlang_b_kernel is not None:
+        p_blocked, EN = erlang_b_kernel(a, c)
+    else:
+        # B(a, k) = a*B(a, k-1) / (k + a*B(a, k-1)) with B(a, 0) = 1 stays in [0, 1], so there is no overflow for large a
+        p_blocked = np.ones(len(a))
+        for k in range(1, np.max(c, initial=0) + 1):
+            aB = a * p_blocked
+            p_blocked = np.where(k <= c, aB / (k + aB), p_blocked)
+        EN = a * (1 - p_blocked)
+
+    return {'a': a, 'c': c, 'rho_offered': a / c, 'rho_real': EN / c, 'E[N]': EN, 'P(blocked)': p_blocked}
+
+
+def erlang_b_table_vec(a: np.ndarray, c: np.ndarray) -> pd.DataFrame:
+    """Calculates the Erlang B results for multiple parameter sets at once (vectorized version of erlang_b_table)
+
+    Args:
+        a (np.ndarray): Workloads ( = lambda/mu); scalars are broadcasted
+        c (np.ndarray): Numbers of operators; scalars are broadcasted
+
+    Returns:
+        pd.DataFrame: Erlang B results table (column c is int64, all other columns are float64)
     """
-    a, c, rho_offered, rho_real, EN, p_blocked = [], [], [], [], [], []
-
-    for parameter in parameters:
-        erl = erlang_b(parameter[0], parameter[1])
-        a.append(erl.a)
-        c.append(erl.c)
-        rho_offered.append(erl.rho_offered)
-        rho_real.append(erl.rho_real)
-        EN.append(erl.EN)
-        p_blocked.append(erl.p_blocked)
-
-    return pd.DataFrame({'a': a, 'c': c, 'rho_offered': rho_offered, 'rho_real': rho_real, 'E[N]': EN, 'P(blocked)': p_blocked})
+    return pd.DataFrame(erlang_b_vec(a, c), copy=False)
@@ -1,8 +1,13 @@
 """Erlang C formula (for a M/M/c system)"""
 
-from math import exp
+from typing import Union
+from functools import lru_cache
+from math import exp, fsum
+import numpy as np
 import pandas as pd
-from .tools import power_factorial
+from scipy.special import gammaln, logsumexp
+from .tools import power_factorial_relative
+from .kernels import erlang_c_kernel, erlang_c_V
 
 
 __title__ = "queuesim"
@@ -27,6 +32,45 @@ limitations under the License.
 __license__ = "Apache 2.0"
 
 
+@lru_cache(maxsize=4096)
+def _erlang_c_P1(a: float, c: int) -> tuple:
+    """Calculates the probability of waiting P1 and P(N = c) (cached, since the same parameters are often used repeatedly).
+    Uses the recurrence V(a, k) = k/a * (V(a, k-1) + 1) with V(a, 1) = 1/a for V(a, k) = (sum over a^j/j! for j = 0..k-1) / (a^k/k!),
+    so neither a^c nor c! has to be calculated and there is no overflow even for large values of c.
+
+    Args:
+        a (float): Workload ( = lambda/mu)
+        c (int): Number of operators
+
+    Returns:
+        tuple: Probability of waiting P1 and P(N = c) (both 0 for unstable systems)
+    """
+    if a <= 0 or a >= c: return 0.0, 0.0
+    v: float = erlang_c_V(a, c)
+    denominator: float = c + (c - a) * v
+    return c / denominator, (c - a) / denominator
+
+
+@lru_cache(maxsize=4096)
+def _erlang_c_metrics(l: float, mu: float, c: int) -> tuple:
+    """Calculates all Erlang C results in one pass (cached, since the same parameters are often used repeatedly).
+
+    Args:
+        l (float): Arrival rate (lambda); has to be non-negative
+        mu (float): Service rate (mu); has to be non-negative
+        c (int): Number of operators; has to be at least 1
+
+    Returns:
+        tuple: P1, P(N = c), E[N_Q], E[N], E[W] and E[V] (the mean values are 0 for unstable systems)
+    """
+    a: float = l / mu if mu > 0 else 0
+    P1, pc = _erlang_c_P1(a, c)
+    if a >= c: return P1, pc, 0, 0, 0, 0
+    ENQ: float = P1 * a / (c - a)
+    EW: float = P1 / (c * mu - l) if P1 > 0 else 0
+    return P1, pc, ENQ, ENQ + a, EW, EW + (1 / mu if mu > 0 else 0)
+
+
 class erlang_c:
     """Erlang C formula (for a M/M/c system)"""
 
@@ -42,14 +86,22 @@ class erlang_c:
         self.__mu: float = max(0, mu)
         self.__a: float = self.__l / self.__mu if self.__mu > 0 else 0
         self.__c: int = max(1, c)
+        self.__rho: float = self.__a / self.__c
 
-        result: float = sum([power_factorial(self.__a, K) for K in range(self.__c)])
-        result = result + power_factorial(self.__a, self.__c) * self.__c / (self.__c - self.__a)
-        self.__p0: float = 1 / result if result > 0 else 0
+        self.__P1: float
+        self.__pc: float
+        self.__ENQ: float
+        self.__EN: float
+        self.__EW: float
+        self.__EV: float
+        self.__P1, self.__pc, self.__ENQ, self.__EN, self.__EW, self.__EV = _erlang_c_metrics(self.__l, self.__mu, self.__c)
 
-        self.__pn: dict[int, float] = {0: self.__p0}
+        # Coefficients for P(W <= t) = stable * (1 - P1 * exp(-decay * t)); chosen so that the result is 0 for unstable systems without any branching
+        self.__stable: float = float(self.__a < self.__c)
+        self.__Pt_P1: float = self.__P1 * self.__stable + (1 - self.__stable)
+        self.__Pt_decay: float = max(self.__c - self.__a, 0) * self.__mu
 
-        self.__P1: float = power_factorial(self.__a, self.__c) * self.__c / (self.__c - self.__a) * self.__p0
+        self.__pn: Union[np.ndarray, None] = None  # P(N = 0), ..., P(N = c); calculated on first use
 
     @property
     def l(self) -> float:
@@ -94,7 +146,7 @@ class erlang_c:
         Returns:
             float: Utilization (rho)
         """
-        return self.__a / self.__c
+        return self.__rho
 
     def pn(self, n: int) -> float:
         """Probability for n clients in the system P(N = n)
@@ -105,15 +157,17 @@ class erlang_c:
         Returns:
             float: Probability for n clients in the system P(N = n)
         """
-        if n in self.__pn: return self.__pn[n]
+        if self.__a == 0: return 1 if n == 0 else 0
+        if self.__a >= self.__c: return 0
 
-        if n <= self.__c:
-            result = power_factorial(self.__a, n) * self.__p0
-        else:
-            result = power_factorial(self.__a, self.__c) * (self.__a / self.__c)**(n - self.__c) * self.__p0
+        if n > self.__c: return self.__pc * self.__rho**(n - self.__c)
 
-        self.__pn[n] = result
-        return result
+        if self.__pn is None:
+            # P(N = k) is proportional to a^k/k! for k = 0..c; the terms are taken relative to the largest one, since a^k/k! can overflow and P(N = c) can underflow (for a << c)
+            terms: list = power_factorial_relative(self.__a, self.__c)
+            norm: float = fsum(terms[:-1]) + terms[-1] * self.__c / (self.__c - self.__a)
+            self.__pn = np.array(terms) / norm
+        return float(self.__pn[n])
 
     @property
     def P1(self) -> float:
@@ -124,17 +178,17 @@ class erlang_c:
         """
         return self.__P1
 
-    def Pt(self, t: float) -> float:
+    def Pt(self, t: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
         """Probability that clients have to wait t or less seconds ( = Erlang C formula)
 
         Args:
-            t (float): Maximum waiting time
+            t (Union[float, np.ndarray]): Maximum waiting time (or array of maximum waiting times)
 
         Returns:
-            float: P(W <= t)
+            Union[float, np.ndarray]: P(W <= t) (array of the same shape if an array was passed)
         """
-        if self.__a >= self.__c: return 0
-        return 1 - self.__P1 * exp(-(self.__c - self.__a) * self.__mu * t)
+        if isinstance(t, np.ndarray): return self.__stable * (1 - self.__Pt_P1 * np.exp(-self.__Pt_decay * t))
+        return self.__stable * (1 - self.__Pt_P1 * exp(-self.__Pt_decay * t))
 
     @property
     def ENQ(self) -> float:
@@ -143,8 +197,7 @@ class erlang_c:
         Returns:
             float: Mean number of clients in the queue E[N_Q]
         """
-        if self.__a >= self.__c: return 0
-        return self.__P1 * self.__a / (self.__c - self.__a)
+        return self.__ENQ
 
     @property
     def EN(self) -> float:
@@ -153,8 +206,7 @@ class erlang_c:
         Returns:
             float: Mean number of clients in the system (waiting and in service process) E[N]
         """
-        if self.__a >= self.__c: return 0
-        return self.__P1 * self.__a / (self.__c - self.__a) + self.__a
+        return self.__EN
 
     @property
     def EW(self) -> float:
@@ -163,8 +215,7 @@ class erlang_c:
         Returns:
             float: Mean waiting time E[W]
         """
-        if self.__a >= self.__c: return 0
-        return self.__P1 / (self.__c * self.__mu - self.__l)
+        return self.__EW
 
     @property
     def EV(self) -> float:
@@ -173,8 +224,7 @@ class erlang_c:
         Returns:
             float: Mean residence time ( = waiting time + service time) E[V]
         """
-        if self.__a >= self.__c: return 0
-        return self.__P1 / (self.__c * self.__mu - self.__l) + 1 / self.__mu
+        return self.__EV
 
 
 def erlang_c_table(parameters: list) -> pd.DataFrame:
@@ -184,20 +234,56 @@ def erlang_c_table(parameters: list) -> pd.DataFrame:
         parameters (list[tuple[float, float, int]]): List of tuples containing the values for lambda, mu and c each
 
     Returns:
-        pd.DataFrame: Erlang C results table
+        pd.DataFrame: Erlang C results table (column c is int64, all other columns are float64)
+    """
+    parameters = np.asarray(parameters, dtype=np.float64).reshape(-1, 3)
+    return erlang_c_table_vec(parameters[:, 0], parameters[:, 1], parameters[:, 2])
+
+
+def erlang_c_vec(l: np.ndarray, mu: np.ndarray, c: np.ndarray) -> dict:
+    """Calculates the Erlang C results for multiple parameter sets at once
+
+    Args:
+        l (np.ndarray): Arrival rates (lambda); scalars are broadcasted
+        mu (np.ndarray): Service rates (mu); scalars are broadcasted
+        c (np.ndarray): Numbers of operators; scalars are broadcasted
+
+    Returns:
+        dict: Erlang C results as NumPy arrays (same keys as the columns of erlang_c_table_vec)
+    """
+    l, mu, c = np.broadcast_arrays(np.maximum(0, np.asarray(l, dtype=np.float64)), np.maximum(0, np.asarray(mu, dtype=np.float64)), np.maximum(1, np.asarray(c, dtype=np.int64)))
+    l, mu, c = np.array(l, ndmin=1), np.array(mu, ndmin=1), np.array(c, ndmin=1)  # Own contiguous copies of the broadcasted inputs (the result arrays are used as DataFrame columns without copying)
+    zero = np.zeros(len(l))
+    a = np.divide(l, mu, out=zero.copy(), where=mu > 0)
+    stable = a < c
+
+    if erlang_c_kernel is not None:
+        P1 = erlang_c_kernel(a, c)
+    else:
+        # log(a^k/k!) for k=0..max(c), summed up to k=c-1 per column in log space (no overflow for large a)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            k = np.arange(np.max(c, initial=0) + 1)[:, np.newaxis]
+            log_terms = np.where(k == 0, 0, k * np.log(a)) - gammaln(k + 1)
+            log_sum = logsumexp(np.where(k < c, log_terms, -np.inf), axis=0)
+            log_tail = log_terms[c, np.arange(len(c))] + np.log(c) - np.log(np.where(stable, c - a, 1))
+            P1 = np.where(stable, 1 / (1 + np.exp(log_sum - log_tail)), 0)
+
+    ENQ = np.divide(P1 * a, c - a, out=zero.copy(), where=stable)
+    EW = np.divide(P1, c * mu - l, out=zero.copy(), where=stable)
+    EV = np.where(stable, EW + np.divide(1, mu, out=zero.copy(), where=mu > 0), 0)
+
+    return {'lambda': l, 'mu': mu, 'a': a, 'c': c, 'rho': a / c, 'E[N_Q]': ENQ, 'E[N]': np.where(stable, ENQ + a, 0), 'E[W]': EW, 'E[V]': EV}
+
+
+def erlang_c_table_vec(l: np.ndarray, mu: np.ndarray, c: np.ndarray) -> pd.DataFrame:
+    """Calculates the Erlang C results for multiple parameter sets at once (vectorized version of erlang_c_table)
+
+    Args:
+        l (np.ndarray): Arrival rates (lambda); scalars are broadcasted
+        mu (np.ndarray): Service rates (mu); scalars are broadcasted
+        c (np.ndarray): Numbers of operators; scalars are broadcasted
+
+    Returns:
+        pd.DataFrame: Erlang C results table (column c is int64, all other columns are float64)
     """
-    l, mu, a, c, rho, ENQ, EN, EW, EV = [], [], [], [], [], [], [], [], []
-
-    for parameter in parameters:
-        erl = erlang_c(parameter[0], parameter[1], parameter[2])
-        l.append(erl.l)
-        mu.append(erl.mu)
-        a.append(erl.a)
-        c.append(erl.c)
-        rho.append(erl.rho)
-        ENQ.append(erl.ENQ)
-        EN.append(erl.EN)
-        EW.append(erl.EW)
-        EV.append(erl.EV)
-
-    return pd.DataFrame({'lambda': l, 'mu': mu, 'a': a, 'c': c, 'rho': rho, 'E[N_Q]': ENQ, 'E[N]': EN, 'E[W]': EW, 'E[V]': EV})
+    return pd.DataFrame(erlang_c_vec(l, mu, c), copy=False)
@@ -1,8 +1,12 @@
 """Extended Erlang C formula (for a M/M/c/K + M system with impatience)"""
 
+from typing import Optional, Union
+from functools import lru_cache
+from math import fsum
+from threading import Lock
 from scipy.special import gammainc
+import numpy as np
 import pandas as pd
-from .tools import power_factorial
 
 
 __title__ = "queuesim"
@@ -27,6 +31,61 @@ limitations under the License.
 __license__ = "Apache 2.0"
 
 
+_Cn_lock = Lock()
+
+
+@lru_cache(maxsize=4096)
+def _erlang_c_ext_logCn_prefix(l: float, mu: float, nu: float, c: int) -> list:
+    """Returns the container for the logarithms of the factors C(0), C(1), ... for one parameter set (cached, so sweeps over K can extend the same array).
+    C(n) = a^n/n! overflows for large values of a, so the factors are only stored as logarithms.
+
+    Args:
+        l (float): Arrival rate (lambda)
+        mu (float): Service rate (mu)
+        nu (float): Cancelation rate (nu)
+        c (int): Number of operators
+
+    Returns:
+        list: List containing the read-only array of the logarithms of the factors calculated so far (at least log C(0), ..., log C(c))
+    """
+    a: float = l / mu if mu > 0 else 0
+    # log C(n) = log C(n-1) + log(a/n) for n <= c
+    with np.errstate(divide='ignore'):
+        logCn: np.ndarray = np.concatenate(([0.0], np.cumsum(np.log(a / np.arange(1, c + 1)))))
+    logCn.flags.writeable = False  # Array is shared between all instances using the same parameters
+    return [logCn]
+
+
+def _erlang_c_ext_logCn(l: float, mu: float, nu: float, c: int, K: int) -> np.ndarray:
+    """Calculates the logarithms of the factors C(0), ..., C(K) (the values are cached per l, mu, nu and c and only extended if a larger K is requested).
+
+    Args:
+        l (float): Arrival rate (lambda)
+        mu (float): Service rate (mu)
+        nu (float): Cancelation rate (nu)
+        c (int): Number of operators
+        K (int): Maximum system size
+
+    Returns:
+        np.ndarray: Read-only array of log C(0), ..., log C(K)
+    """
+    container: list = _erlang_c_ext_logCn_prefix(l, mu, nu, c)
+    logCn: np.ndarray = container[0]
+    if len(logCn) <= K:
+        with _Cn_lock:
+            logCn = container[0]
+            if len(logCn) <= K:
+                # log C(n) = log C(n-1) + log(l/(c*mu + (n-c)*nu)) for n > c as one cumulative sum starting at the last known value
+                last: int = len(logCn) - 1
+                with np.errstate(divide='ignore'):
+                    summands: np.ndarray = np.log(l / (c * mu + np.arange(last - c, K - c + 1) * nu))
+                summands[0] = logCn[last]
+                logCn = np.concatenate((logCn[:last], np.cumsum(summands)))
+                logCn.flags.writeable = False
+                container[0] = logCn
+    return logCn[:K + 1]
+
+
 class erlang_c_ext:
     """Extended Erlang C formula (for a M/M/c/K + M system with impatience)"""
 
@@ -47,10 +106,12 @@ class erlang_c_ext:
         self.__c: int = max(1, c)
         self.__K: int = max(self.__c, K)
 
-        self.__Cn: dict[int, float] = {}
-
-        p0 = 1 / sum([self.Cn(i) for i in range(self.__K + 1)])
-        self.__pn: dict[int, float] = {0: p0}
+        self.__logCn: np.ndarray = _erlang_c_ext_logCn(self.__l, self.__mu, self.__nu, self.__c, self.__K)
+        weights: np.ndarray = np.exp(self.__logCn - np.max(self.__logCn))  # C(n) relative to the largest factor (at most 1, so there is no overflow)
+        self.__pn: np.ndarray = weights / fsum(weights)  # Exactly rounded sum, the factors span many orders of magnitude
+        self.__gamma_a: np.ndarray = np.arange(1, self.__K - self.__c + 1, dtype=np.float64)  # Shape parameters of the waiting time distributions for n = c, ..., K-1
+        self.__ENQ: Optional[float] = None
+        self.__EN: Optional[float] = None
 
     @property
     def l(self) -> float:
@@ -124,14 +185,12 @@ class erlang_c_ext:
         Returns:
             float: C(n)
         """
-        if n in self.__Cn: return self.__Cn[n]
-        if n <= self.__c:
-            value = power_factorial(self.__l / self.__mu, n)
-        else:
-            value = power_factorial(self.__l / self.__mu, self.__c)
-            for i in range(1, n - self.__c + 1): value = value * self.__l / (self.__c * self.__mu + i * self.__nu)
-
-        self.__Cn[n] = value
+        if n <= self.__K: return float(np.exp(self.__logCn[n]))
+
+        # Extend the values beyond C(K) (C(0), ..., C(K) are already calculated in the constructor)
+        value: float = float(np.exp(self.__logCn[self.__K]))
+        for i in range(self.__K + 1, n + 1):
+            value = value * self.__l / (self.__c * self.__mu + (i - self.__c) * self.__nu)
         return value
 
     def pn(self, n: int) -> float:
@@ -144,12 +203,7 @@ class erlang_c_ext:
             float: Probability for n clients in the system P(N = n)
         """
         if n > self.__K: return 0
-
-        if n in self.__pn: return self.__pn[n]
-
-        value = self.Cn(n) * self.__pn[0]
-        self.__pn[n] = value
-        return value
+        return float(self.__pn[n])
 
     @property
     def p_blocked(self) -> float:
@@ -167,32 +221,22 @@ class erlang_c_ext:
         Returns:
             float: Cancelation probability P(A)
         """
-        p0 = self.pn(0)
-        return sum([self.__nu / self.__l * (n - self.__c) * p0 * self.Cn(n) for n in range(self.__c + 1, self.__K + 1)])
+        if self.__l == 0: return 0
+        return self.__nu / self.__l * self.ENQ
 
-    def Pt(self, t: float) -> float:
+    def Pt(self, t: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
         """Probability that clients have to wait t or less seconds ( = extended Erlang C formula)
 
         Args:
-            t (float): Maximum waiting time
+            t (Union[float, np.ndarray]): Maximum waiting time (or array of maximum waiting times)
 
         Returns:
-            float: P(W <= t)
+            Union[float, np.ndarray]: P(W <= t) (array of the same shape if an array was passed)
         """
-        p0 = self.pn(0)
-
-        if p0 == 0:
-            p = 1
-        else:
-            p = 1 - p0 * self.Cn(self.__K)
-
-        for n in range(self.__c, self.__K):
-            a = n - self.__c + 1
-            x = (self.__c * self.__mu + self.__nu) * t
-            g = 1 - gammainc(a, x)
-            p = p - p0 * self.Cn(n) * g
-
-        return p
+        x = (self.__c * self.__mu + self.__nu) * np.asarray(t, dtype=np.float64)[..., np.newaxis]
+        g = 1 - gammainc(self.__gamma_a, x)
+        p = np.maximum(0, 1 - self.__pn[self.__K] - np.dot(g, self.__pn[self.__c:self.__K]))  # Clip rounding errors below zero
+        return p if isinstance(t, np.ndarray) else float(p)
 
     @property
     def rho_real(self) -> float:
@@ -210,8 +254,8 @@ class erlang_c_ext:
         Returns:
             float: Mean number of clients in the queue E[N_Q]
         """
-        p0 = self.pn(0)
-        return sum([p0 * (n - self.__c) * self.Cn(n) for n in range(self.__c + 1, self.__K + 1)])
+        if self.__ENQ is None: self.__ENQ = float(np.dot(np.arange(1, self.__K - self.__c + 1), self.__pn[self.__c + 1:]))
+        return self.__ENQ
 
     @property
     def EN(self) -> float:
@@ -220,8 +264,8 @@ class erlang_c_ext:
         Returns:
             float: Mean number of clients in the system (waiting and in service process) E[N]
         """
-        p0 = self.pn(0)
-        return sum([p0 * n * self.Cn(n) for n in range(1, self.__K + 1)])
+        if self.__EN is None: self.__EN = float(np.dot(np.arange(1, self.__K + 1), self.__pn[1:]))
+        return self.__EN
 
     @property
     def EW(self) -> float:
@@ -249,25 +293,62 @@ def erlang_c_ext_table(parameters: list) -> pd.DataFrame:
         parameters (list[tuple[float, float, float, int, int]]): List of tuples containing the values for lambda, mu, nu, c and K each
 
     Returns:
-        pd.DataFrame: Extended Erlang C results table
+        pd.DataFrame: Extended Erlang C results table (columns c and K are int64, all other columns are float64)
+    """
+    parameters = np.asarray(parameters, dtype=np.float64).reshape(-1, 5)
+    return erlang_c_ext_table_vec(parameters[:, 0], parameters[:, 1], parameters[:, 2], parameters[:, 3], parameters[:, 4])
+
+
+def erlang_c_ext_vec(l: np.ndarray, mu: np.ndarray, nu: np.ndarray, c: np.ndarray, K: np.ndarray) -> dict:
+    """Calculates the extended Erlang C results for multiple parameter sets at once
+
+    Args:
+        l (np.ndarray): Arrival rates (lambda); scalars are broadcasted
+        mu (np.ndarray): Service rates (mu); scalars are broadcasted
+        nu (np.ndarray): Cancelation rates (nu); scalars are broadcasted
+        c (np.ndarray): Numbers of operators; scalars are broadcasted
+        K (np.ndarray): Maximum system sizes; scalars are broadcasted
+
+    Returns:
+        dict: Extended Erlang C results as NumPy arrays (same keys as the columns of erlang_c_ext_table_vec)
+    """
+    l, mu, nu, c, K = np.broadcast_arrays(np.maximum(0, np.asarray(l, dtype=np.float64)), np.maximum(0, np.asarray(mu, dtype=np.float64)), np.maximum(0, np.asarray(nu, dtype=np.float64)), np.maximum(1, np.asarray(c, dtype=np.int64)), np.asarray(K, dtype=np.int64))
+    l, mu, nu, c, K = np.array(l, ndmin=1), np.array(mu, ndmin=1), np.array(nu, ndmin=1), np.array(c, ndmin=1), np.array(np.maximum(c, K), ndmin=1)  # Own contiguous copies of the broadcasted inputs, so the DataFrame can use them without copying
+    a = np.divide(l, mu, out=np.zeros(len(l)), where=mu > 0)
+
+    # C(n) for n = 0..max(K); C(n) = C(n-1) * a/n for n <= c and C(n) = C(n-1) * l/(c*mu+(n-c)*nu) for n > c
+    n = np.arange(1, (int(np.max(K)) if len(K) > 0 else 0) + 1)[:, np.newaxis]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        factors = np.where(n <= c, a / n, l / (c * mu + (n - c) * nu))
+        factors = np.where(n <= K, factors, 0)
+        logCn = np.vstack((np.zeros((1, len(l))), np.cumsum(np.log(factors), axis=0)))  # Logarithms, since C(n) = a^n/n! overflows for large values of a
+    Cn = np.exp(logCn - np.max(logCn, axis=0))  # C(n) relative to the largest factor per column (only the ratios are needed)
+    n = np.arange(len(Cn))[:, np.newaxis]
+
+    p0 = 1 / np.sum(Cn, axis=0)
+    ENQ = p0 * np.sum(np.maximum(0, n - c) * Cn, axis=0)
+    EN = p0 * np.sum(n * Cn, axis=0)
+    PA = np.divide(nu * ENQ, l, out=np.zeros(len(l)), where=l > 0)
+    p_blocked = p0 * Cn[K, np.arange(len(K))]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        EW = ENQ / l
+        EV = EN / l
+
+    return {'lambda': l, 'mu': mu, 'nu': nu, 'a': a, 'c': c, 'K': K, 'rho_offered': a / c, 'rho_real': (EN - ENQ) / c, 'P(blocked)': p_blocked, 'P(A)': PA, 'E[N_Q]': ENQ, 'E[N]': EN, 'E[W]': EW, 'E[V]': EV}
+
+
+def erlang_c_ext_table_vec(l: np.ndarray, mu: np.ndarray, nu: np.ndarray, c: np.ndarray, K: np.ndarray) -> pd.DataFrame:
+    """Calculates the extended Erlang C results for multiple parameter sets at once (vectorized version of erlang_c_ext_table)
+
+    Args:
+        l (np.ndarray): Arrival rates (lambda); scalars are broadcasted
+        mu (np.ndarray): Service rates (mu); scalars are broadcasted
+        nu (np.ndarray): Cancelation rates (nu); scalars are broadcasted
+        c (np.ndarray): Numbers of operators; scalars are broadcasted
+        K (np.ndarray): Maximum system sizes; scalars are broadcasted
+
+    Returns:
+        pd.DataFrame: Extended Erlang C results table (columns c and K are int64, all other columns are float64)
     """
-    l, mu, nu, a, c, K, rho_offered, rho_real, p_blocked, PA, ENQ, EN, EW, EV = [], [], [], [], [], [], [], [], [], [], [], [], [], []
-
-    for parameter in parameters:
-        erl = erlang_c_ext(parameter[0], parameter[1], parameter[2], parameter[3], parameter[4])
-        l.append(erl.l)
-        mu.append(erl.mu)
-        nu.append(erl.nu)
-        a.append(erl.a)
-        c.append(erl.c)
-        K.append(erl.c)
-        rho_offered.append(erl.rho_offered)
-        rho_real.append(erl.rho_real)
-        p_blocked.append(erl.p_blocked)
-        PA.append(erl.PA)
-        ENQ.append(erl.ENQ)
-        EN.append(erl.EN)
-        EW.append(erl.EW)
-        EV.append(erl.EV)
-
-    return pd.DataFrame({'lambda': l, 'mu': mu, 'nu': nu, 'a': a, 'c': c, 'K': K, 'rho_offered': rho_offered, 'rho_real': rho_real, 'P(blocked)': p_blocked, 'P(A)': PA, 'E[N_Q]': ENQ, 'E[N]': EN, 'E[W]': EW, 'E[V]': EV})
+    return pd.DataFrame(erlang_c_ext_vec(l, mu, nu, c, K), copy=False)
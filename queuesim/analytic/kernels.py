@@ -0,0 +1,112 @@
+"""Compiled kernels for the Erlang B and Erlang C formulas (only available if Numba is installed or if the kernels were compiled ahead of time via build_aot.py)."""
+
+import numpy as np
+
+try:
+    from .qsanalytic_aot import erlang_b as _erlang_b_aot, erlang_c as _erlang_c_aot
+except ImportError:
+    _erlang_b_aot = None
+    _erlang_c_aot = None
+
+try:
+    from numba import guvectorize, njit
+except ImportError:
+    guvectorize = None
+    njit = None
+
+
+__title__ = "queuesim"
+__version__ = "1.0"
+__author__ = "Alexander Herzog"
+__email__ = "alexander.herzog@tu-clausthal.de"
+__copyright__ = """
+Copyright 2022 Alexander Herzog
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+__license__ = "Apache 2.0"
+
+
+def _erlang_b_kernel(a, c, p_blocked, EN) -> None:
+    # Sums over a^n/n! and n*a^n/n! for n = 0..c in one pass
+    term: float = 1.0
+    s: float = 1.0
+    s_n: float = 0.0
+    for n in range(1, c + 1):
+        term *= a / n
+        s += term
+        s_n += n * term
+        if s > 1e300:  # Rescale to avoid overflow for large a (only the ratios are needed)
+            term *= 1e-300
+            s *= 1e-300
+            s_n *= 1e-300
+    p_blocked[0] = term / s
+    EN[0] = s_n / s
+
+
+def _erlang_c_kernel(a, c, P1) -> None:
+    # Sum over a^n/n! for n = 0..c-1 and a^c/c! in one pass
+    term: float = 1.0
+    s: float = 1.0
+    for n in range(1, c):
+        term *= a / n
+        s += term
+        if s > 1e300:  # Rescale to avoid overflow for large a (only the ratios are needed)
+            term *= 1e-300
+            s *= 1e-300
+    term *= a / c
+    if a < c:
+        tail: float = term * c / (c - a)
+        P1[0] = tail / (s + tail)
+    else:
+        P1[0] = 0
+
+
+def _erlang_c_V(a: float, c: int) -> float:
+    # V(a, k) = k/a * (V(a, k-1) + 1) with V(a, 1) = 1/a, i.e. V(a, c) = (sum over a^j/j! for j = 0..c-1) / (a^c/c!)
+    # V(a, k) only grows once k > a, so for a << c it overflows long before k = c; the remaining steps would keep it at inf (P1 = 0 either way)
+    v: float = 1.0 / a
+    for k in range(2, c + 1):
+        v = k / a * (v + 1.0)
+        if v > 1e308: return np.inf
+    return v
+
+
+def _erlang_b_aot_kernel(a: np.ndarray, c: np.ndarray) -> tuple:
+    a = np.ascontiguousarray(a, dtype=np.float64)
+    c = np.ascontiguousarray(c, dtype=np.int64)
+    p_blocked = np.empty(len(a))
+    EN = np.empty(len(a))
+    _erlang_b_aot(a, c, p_blocked, EN)
+    return p_blocked, EN
+
+
+def _erlang_c_aot_kernel(a: np.ndarray, c: np.ndarray) -> np.ndarray:
+    a = np.ascontiguousarray(a, dtype=np.float64)
+    c = np.ascontiguousarray(c, dtype=np.int64)
+    P1 = np.empty(len(a))
+    _erlang_c_aot(a, c, P1)
+    return P1
+
+
+if _erlang_b_aot is not None:
+    erlang_b_kernel = _erlang_b_aot_kernel
+    erlang_c_kernel = _erlang_c_aot_kernel
+elif guvectorize is not None:
+    erlang_b_kernel = guvectorize(["void(float64, int64, float64[:], float64[:])"], "(),()->(),()", nopython=True, cache=True)(_erlang_b_kernel)
+    erlang_c_kernel = guvectorize(["void(float64, int64, float64[:])"], "(),()->()", nopython=True, cache=True)(_erlang_c_kernel)
+else:
+    erlang_b_kernel = None
+    erlang_c_kernel = None
+
+erlang_c_V = _erlang_c_V if njit is None else njit("float64(float64, int64)", cache=True)(_erlang_c_V)
@@ -1,5 +1,6 @@
 """Auxiliary functions for calculation of Erlang B and Erlang C formulas."""
 
+from typing import Iterator
 from math import prod
 
 
@@ -48,3 +49,44 @@ def power_factorial(x: float, n: int) -> float:
     prod: float = 1
     for i in range(1, n + 1): prod *= x / i
     return prod
+
+
+def power_factorial_iter(x: float, n_max: int) -> Iterator[float]:
+    """Yields the products over x/i für i = 1..n for n = 0..n_max
+    (each value is calculated from the previous one, so all values together need only O(n_max) operations)
+
+    Args:
+        x (float): x
+        n_max (int): Maximum n
+
+    Yields:
+        Iterator[float]: Product over x/i für i = 1..n for n = 0..n_max
+    """
+    prod: float = 1
+    yield prod
+    for i in range(1, n_max + 1):
+        prod *= x / i
+        yield prod
+
+
+def power_factorial_relative(x: float, n_max: int) -> list:
+    """Calculates the products over x/i für i = 1..n for n = 0..n_max divided by the largest of these products
+    (the largest value is 1, so there is no overflow even for large x; only the ratios of the values are correct)
+
+    Args:
+        x (float): x
+        n_max (int): Maximum n
+
+    Returns:
+        list[float]: Product over x/i für i = 1..n for n = 0..n_max relative to the largest product
+    """
+    if x <= 0: return [1.0] + [0.0] * n_max
+
+    # x^n/n! is largest for n = floor(x); going up and down from there all values stay at most 1
+    k: int = min(n_max, int(x))
+    values: list = [0.0] * (n_max + 1)
+    values[k] = 1.0
+    for n in range(k, 0, -1): values[n - 1] = values[n] * n / x
+    for n in range(k, n_max): values[n + 1] = values[n] * x / (n + 1)
+    return values
+
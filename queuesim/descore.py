@@ -1,13 +1,18 @@
 """Base classes for event processing."""
 
-import functools
 from typing import Optional
 from abc import abstractmethod
 from time import perf_counter
 from bisect import insort
 from collections import deque
+from itertools import count
 import heapq
 
+try:
+    from sortedcontainers import SortedList
+except ImportError:
+    SortedList = None
+
 
 __title__ = "queuesim"
 __version__ = "1.0"
@@ -31,10 +36,9 @@ limitations under the License.
 __license__ = "Apache 2.0"
 
 
-@functools.total_ordering
 class Event:
     """Base class for all events."""
-    __slots__ = ("__simulator", "__time", "__removed")
+    __slots__ = ("__simulator", "__time", "removed")
 
     def __init__(self, simulator, time: float) -> None:
         """Base class for all events.
@@ -46,7 +50,7 @@ class Event:
         """
         self.__simulator = simulator
         self.__time: float = time
-        self.__removed: bool = False
+        self.removed: bool = False  # Is the event active (False) or is it to be ignored (True)? (Plain attribute instead of a property, because it is checked for every event.)
         simulator.add_event(self)
 
     @abstractmethod
@@ -57,16 +61,7 @@ class Event:
     def remove(self) -> None:
         """Marks the event as removed. It will be ignored on execution time.
         """
-        self.__removed = True
-
-    @property
-    def removed(self) -> bool:
-        """Is the event active (False) or is it to be ignored (True)?
-
-        Returns:
-            bool: Is the event active (False) or is it to be ignored (True)?
-        """
-        return self.__removed
+        self.removed = True
 
     @property
     def simulator(self):
@@ -86,22 +81,22 @@ class Event:
         """
         return self.__time
 
-    def __eq__(self, other) -> bool:
-        if not isinstance(other, Event): return False
-        return self.__time == other.time
-
     def __lt__(self, other) -> bool:
-        if not isinstance(other, Event): return False
+        # Only needed by the list based event lists (insort); the heap based event list compares (time, insertion number) tuples
         return self.__time < other.time
 
 
+_TAIL_SEARCH_STEPS: int = 8  # Number of events checked backwards from the tail of the list based event lists before switching to binary search
+
+
 class _ListEventList:
     """Event list to manage the events during the simulation."""
-    __slots__ = ("__events")
+    __slots__ = ("__events", "__head")
 
     def __init__(self) -> None:
         """Event list to manage the events during the simulation."""
-        self.__events: list[Event] = []
+        self.__events: list = []  # Events in chronological order starting at index __head (the entries before are already popped)
+        self.__head: int = 0
 
     def add(self, event: Event) -> None:
         """Adds an event to the event list.
@@ -109,20 +104,34 @@ class _ListEventList:
         Args:
             event (Event): Event to be added to the list
         """
-        l: list[Event] = self.__events
+        l: list = self.__events
+        head: int = self.__head
         size: int = len(l)
 
-        if size == 0:
+        if size == head:
             l.append(event)
         else:
             newEventTime: float = event.time
-            if newEventTime < l[0].time:
-                l.insert(0, event)
+            if newEventTime < l[head].time:
+                if head > 0:
+                    # Reuse the slot of the last popped event instead of shifting the whole list
+                    self.__head = head - 1
+                    l[head - 1] = event
+                else:
+                    l.insert(0, event)
                 return
             if newEventTime > l[size - 1].time:
-                self.__events.append(event)
+                l.append(event)
                 return
-            insort(l, event)
+
+            # New events are usually scheduled close to the end of the list, so search backwards from the tail first
+            i: int = size - 1
+            stop: int = max(head, size - _TAIL_SEARCH_STEPS)
+            while i >= stop and l[i].time > newEventTime: i -= 1
+            if i >= stop:
+                l.insert(i + 1, event)
+            else:
+                insort(l, event, head, stop)
 
     def pop(self) -> Optional[Event]:
         """Returns the next event to be executed in chronological order.
@@ -131,8 +140,20 @@ class _ListEventList:
         Returns:
             Event: Next event or None if there are no more events
         """
-        if not self.__events: return None
-        return self.__events.pop(0)
+        l: list = self.__events
+        head: int = self.__head
+        if head == len(l): return None
+
+        # Popping from the front of a list would shift all remaining events (O(n)), so only the head index is moved
+        event: Event = l[head]
+        l[head] = None
+        head += 1
+        if head >= 1024 and 2 * head >= len(l):
+            # Drop the popped slots from time to time (amortized O(1) per event)
+            del l[:head]
+            head = 0
+        self.__head = head
+        return event
 
     def remove(self, event: Event) -> bool:
         """Removes an event from the list.
@@ -141,10 +162,10 @@ class _ListEventList:
             event (Event): Event to be removed
 
         Returns:
-            bool: Returns True if the event was contained in the list and could be removed
+            bool: Returns True if the event was not already marked as removed
         """
-        if not event in self.__events: return False
-        self.__events.remove(event)
+        if event.removed: return False
+        event.remove()  # Do not remove event from list (O(n)) but mark as removed (it will be skipped in Simulator.run)
         return True
 
 
@@ -175,7 +196,15 @@ class _DequeEventList:
             if newEventTime > l[size - 1].time:
                 self.__events.append(event)
                 return
-            insort(l, event)
+
+            # New events are usually scheduled close to the end of the list, so search backwards from the tail first
+            i: int = size - 1
+            stop: int = max(0, size - _TAIL_SEARCH_STEPS)
+            while i >= stop and l[i].time > newEventTime: i -= 1
+            if i >= stop:
+                l.insert(i + 1, event)
+            else:
+                insort(l, event, 0, stop)
 
     def pop(self) -> Optional[Event]:
         """Returns the next event to be executed in chronological order.
@@ -194,21 +223,21 @@ class _DequeEventList:
             event (Event): Event to be removed
 
         Returns:
-            bool: Returns True if the event was contained in the list and could be removed
+            bool: Returns True if the event was not already marked as removed
         """
-        if not event in self.__events: return False
-        self.__events.remove(event)
+        if event.removed: return False
+        event.remove()  # Do not remove event from list (O(n)) but mark as removed (it will be skipped in Simulator.run)
         return True
 
 
 class _HeapqEventList:
     """Event list to manage the events during the simulation."""
-    __slots__ = ("__events")
+    __slots__ = ("__events", "__counter")
 
     def __init__(self) -> None:
         """Event list to manage the events during the simulation."""
-        self.__events = []
-        heapq.heapify(self.__events)
+        self.__events: list[tuple] = []  # Heap of (time, insertion number, event) tuples
+        self.__counter = count()
 
     def add(self, event: Event) -> None:
         """Adds an event to the event list.
@@ -216,7 +245,8 @@ class _HeapqEventList:
         Args:
             event (Event): Event to be added to the list
         """
-        heapq.heappush(self.__events, event)
+        # The insertion number keeps events with the same time in FIFO order (like in the list based event lists)
+        heapq.heappush(self.__events, (event.time, next(self.__counter), event))
 
     def pop(self) -> Optional[Event]:
         """Returns the next event to be executed in chronological order.
@@ -226,7 +256,7 @@ class _HeapqEventList:
             Event: Next event or None if there are no more events
         """
         if not self.__events: return None
-        return heapq.heappop(self.__events)
+        return heapq.heappop(self.__events)[2]
 
     def remove(self, event: Event) -> bool:
         """Removes an event from the list.
@@ -235,28 +265,92 @@ class _HeapqEventList:
             event (Event): Event to be removed
 
         Returns:
-            bool: Returns True if the event was contained in the list and could be removed
+            bool: Returns True if the event was not already marked as removed
         """
-        if not event in self.__events: return False
-        event.remove()  # Do not remove event from heap but mark as removed
+        if event.removed: return False
+        event.remove()  # Do not remove event from heap but mark as removed (it will be skipped in Simulator.run)
         return True
 
     def list_events(self) -> str:
-        return ", ".join(str(round(e.time, 1)) for e in list(self.__events))
+        return ", ".join(str(round(entry[0], 1)) for entry in sorted(self.__events))
+
+
+class _SortedListEventList:
+    """Event list to manage the events during the simulation.
+    Removed events are really deleted from the list (instead of only being marked), so this event list is useful for models in which most events are canceled.
+    Needs the sortedcontainers package."""
+    __slots__ = ("__events", "__entries", "__counter")
+
+    def __init__(self) -> None:
+        """Event list to manage the events during the simulation."""
+        if SortedList is None: raise RuntimeError("The sortedlist event list requires the sortedcontainers package")
+        self.__events = SortedList()  # Sorted (time, insertion number, event) tuples
+        self.__entries: dict = {}  # Event -> list entry (needed to find the entry when removing an event)
+        self.__counter = count()
+
+    def add(self, event: Event) -> None:
+        """Adds an event to the event list.
+
+        Args:
+            event (Event): Event to be added to the list
+        """
+        entry: tuple = (event.time, next(self.__counter), event)
+        self.__events.add(entry)
+        self.__entries[event] = entry
+
+    def pop(self) -> Optional[Event]:
+        """Returns the next event to be executed in chronological order.
+        The event will be removed from the list.
+
+        Returns:
+            Event: Next event or None if there are no more events
+        """
+        if not self.__events: return None
+        event: Event = self.__events.pop(0)[2]
+        del self.__entries[event]
+        return event
+
+    def remove(self, event: Event) -> bool:
+        """Removes an event from the list.
+
+        Args:
+            event (Event): Event to be removed
+
+        Returns:
+            bool: Returns True if the event was contained in the list and could be removed
+        """
+        entry: Optional[tuple] = self.__entries.pop(event, None)
+        if entry is None: return False
+        self.__events.remove(entry)  # O(log n)
+        event.remove()
+        return True
+
+
+_EVENT_LISTS: dict = {"heap": _HeapqEventList, "list": _ListEventList, "deque": _DequeEventList, "sortedlist": _SortedListEventList}
 
 
 class Simulator:
     """Main system for running the simulation and managing the events."""
-    __slots__ = ("__time", "__events", "__eventCount", "__nowEvent", "__runTime", "__initObjects")
+    __slots__ = ("__time", "__eventListType", "__events", "__eventCount", "__nowEvent", "__runTime", "__initObjects", "__initDoneObjects")
 
-    def __init__(self) -> None:
-        """Main system for running the simulation and managing the events."""
+    def __init__(self, event_list: str = "heap") -> None:
+        """Main system for running the simulation and managing the events.
+
+        Args:
+            event_list (str, optional): Type of the event list: "heap" (O(log n) per event), "list" or "deque" (O(n) per insertion, but fast if new events are mostly scheduled at the end) or "sortedlist" (O(log n) per event, removed events are really deleted; needs the sortedcontainers package). Defaults to "heap".
+
+        Raises:
+            RuntimeError: Raises an error if the event list type is unknown
+        """
+        if event_list not in _EVENT_LISTS: raise RuntimeError("Unknown event list type: " + str(event_list))
         self.__time: float = 0
-        self.__events: _ListEventList = _ListEventList()  # _ListEventList or _DequeEventList or _HeapqEventList can be used here; all of them are quite slow
+        self.__eventListType = _EVENT_LISTS[event_list]
+        self.__events = self.__eventListType()
         self.__eventCount: int = 0
         self.__runTime: float = 0
         self.__nowEvent: Optional[Event] = None
         self.__initObjects: list = []
+        self.__initDoneObjects: list = []
 
     @property
     def time(self) -> float:
@@ -279,12 +373,12 @@ class Simulator:
             self.__events.add(event)
 
     def __pop_event(self) -> Optional[Event]:
-        if self.__nowEvent is not None:
-            event: Optional[Event] = self.__nowEvent
+        event: Optional[Event] = self.__nowEvent
+        if event is not None:
             self.__nowEvent = None
             return event
 
-        event: Optional[Event] = self.__events.pop()
+        event = self.__events.pop()
         if event is not None and not event.removed:
             assert self.__time <= event.time, "Event is earlier than previous event."
             self.__time = event.time
@@ -310,25 +404,40 @@ class Simulator:
 
         # Initialization of the objects that create events, etc.
         for object in self.__initObjects: object.init()
+        self.__initDoneObjects.extend(self.__initObjects)
         self.__initObjects.clear()
 
         startTime: float = perf_counter()
 
         # Start of the entire simulation
-        event: Optional[Event] = self.__pop_event()
+        pop_event = self.__pop_event  # Bound method is looked up only once instead of once per event
+        event: Optional[Event] = pop_event()
         while event is not None:
             if not event.removed:
                 event.run()
                 self.__eventCount += 1
-            event = self.__pop_event()
+            event = pop_event()
 
         self.__runTime = perf_counter() - startTime
 
+    def reset(self) -> None:
+        """Resets the simulator, so the model can be simulated again without rebuilding the stations.
+        The event list and the counters are cleared, all initialized objects are reset (by calling their reset() method) and will be initialized again on the next run.
+        """
+        self.__time = 0
+        self.__events = self.__eventListType()
+        self.__eventCount = 0
+        self.__runTime = 0
+        self.__nowEvent = None
+        for object in self.__initDoneObjects: object.reset()
+        self.__initObjects = self.__initDoneObjects + self.__initObjects
+        self.__initDoneObjects = []
+
     def register_init(self, initObject: object):
         """Registers an object to be notified before the simulation starts.
 
         Args:
-            initObject (object): Object, which must have an init() method
+            initObject (object): Object, which must have an init() method (and a reset() method if Simulator.reset is used)
         """
         self.__initObjects.append(initObject)
 
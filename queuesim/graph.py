@@ -1,5 +1,6 @@
 """Function for building a graph from the queueing network"""
 
+from collections import defaultdict
 import networkx as nx
 from .stations import Source
 
@@ -26,28 +27,24 @@ limitations under the License.
 __license__ = "Apache 2.0"
 
 
-def _build_station_name(station, station_names: dict, last_nr_for_type: dict):
+def _build_station_name(station, station_names: dict, last_nr_for_type: defaultdict):
     if station in station_names: return
     cls = type(station)
-    base_name: str = str(cls.__name__)
 
     addon: str = ""
-    if isinstance(station, Source): addon = " \"" + station.client_type_name + "\""
+    if isinstance(station, Source): addon = f" \"{station.client_type_name}\""
 
-    if cls in last_nr_for_type:
-        nr = last_nr_for_type[cls] + 1
-    else:
-        nr = 1
+    nr: int = last_nr_for_type[cls] + 1
     last_nr_for_type[cls] = nr
-    station_names[station] = base_name + " " + str(nr) + addon
+    station_names[station] = f"{cls.__name__} {nr}{addon}"
 
 
-def _add_station_to_graph(station, station_names: dict, todo: list, edges: list, graph):
-    name = station_names[station]
-    graph.add_node(name)
+def _add_station_to_graph(station, seen: set, todo: list, edges: list):
     for next_station in station.next_stations:
         edges.append((station, next_station))
-        if not next_station in station_names and not next_station in todo: todo.append(next_station)
+        if next_station not in seen:
+            seen.add(next_station)
+            todo.append(next_station)
 
 
 def build_graph(initial_nodes: list):
@@ -60,17 +57,38 @@ def build_graph(initial_nodes: list):
         networkx.DiGraph: network graph
     """
     todo = list(initial_nodes)
+    seen = set(todo)  # All stations which are already named or waiting in todo (O(1) membership test instead of searching todo)
     station_names = {}
-    last_nr_for_type = {}
+    last_nr_for_type = defaultdict(int)
     edges = []
-    dg = nx.DiGraph()
 
     while todo:
         station = todo.pop()
         _build_station_name(station, station_names, last_nr_for_type)
-        _add_station_to_graph(station, station_names, todo, edges, dg)
+        _add_station_to_graph(station, seen, todo, edges)
 
-    for edge in edges:
-        dg.add_edge(station_names[edge[0]], station_names[edge[1]])
+    dg = nx.DiGraph()
+    dg.add_nodes_from(station_names.values())
+    dg.add_edges_from((station_names[a], station_names[b]) for a, b in edges)
 
     return dg
+
+
+def graph_layout(dg, seed: int = 0) -> dict:
+    """Calculates the node positions for plotting a graph generated by `build_graph`.
+    The positions are stored in the graph, so redrawing the same graph does not recalculate the layout.
+
+    Args:
+        dg (networkx.DiGraph): Network graph
+        seed (int, optional): Seed for the spring layout which is used if graphviz is not available. Defaults to 0.
+
+    Returns:
+        dict: Node positions (can be passed as `pos` parameter to `networkx.draw`)
+    """
+    if "pos" in dg.graph: return dg.graph["pos"]
+    try:
+        pos = nx.nx_agraph.graphviz_layout(dg, prog="dot")
+    except ImportError:
+        pos = nx.spring_layout(dg, seed=seed)
+    dg.graph["pos"] = pos
+    return pos
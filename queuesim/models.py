@@ -1,9 +1,10 @@
 """Auxiliary functions for creation of M/M/c and call center models"""
 
 from typing import Optional
-from .random_dist import exp as dist_exp
+from .random_dist import exp as dist_exp, exp_stream as dist_exp_stream, exp_bulk as dist_exp_bulk
 from .descore import Simulator
 from .stations import DecideCondition, Source, Process, Decide, Delay, Dispose, Station
+from .statistics import RecordDiscrete
 
 
 __title__ = "queuesim"
@@ -41,7 +42,7 @@ def get_simulator_from_model(model: dict) -> Simulator:
     return anyStation.simulator
 
 
-def mmc_model(mean_i: float, mean_s: float, c: int, count: int, record_values: bool = False) -> dict:
+def mmc_model(mean_i: float, mean_s: float, c: int, count: int, record_values: bool = False, seed_i: Optional[int] = None, bulk: bool = False) -> dict:
     """Generates a simple M/M/c model.
 
     Args:
@@ -50,13 +51,19 @@ def mmc_model(mean_i: float, mean_s: float, c: int, count: int, record_values: b
         c (int): Number of operators (c)
         count (int): Client arrivals to be simulated
         record_values (bool, optional): Record each state change? Defaults to False.
+        seed_i (Optional[int], optional): If not None, the inter-arrival times are drawn from a separate random number stream initialized by this seed. Models with the same seed and the same E[I] get identical arrival streams (common random numbers). Defaults to None.
+        bulk (bool, optional): Draw all inter-arrival and service times at once in advance (faster, but needs memory for 2*count values and the model can only be simulated once, i.e. not after Simulator.reset()). Defaults to False.
 
     Returns:
         object: Entire model consisting of stations and input parameters
     """
     # Define parameters
-    get_i = dist_exp(mean_i)
-    get_s = dist_exp(mean_s)
+    if bulk:
+        get_i = dist_exp_bulk(mean_i, count, seed_i)
+        get_s = dist_exp_bulk(mean_s, count)
+    else:
+        get_i = dist_exp(mean_i) if seed_i is None else dist_exp_stream(mean_i, seed_i)
+        get_s = dist_exp(mean_s)
 
     # Create and configure stations
     simulator = Simulator()
@@ -72,6 +79,47 @@ def mmc_model(mean_i: float, mean_s: float, c: int, count: int, record_values: b
     return {'Source': source, 'Process': process, 'Dispose': dispose, 'meanI': mean_i, 'meanS': mean_s, 'c': c}
 
 
+def mmc_model_qdc(mean_i: float, mean_s: float, c: int, count: int) -> dict:
+    """Simulates a simple M/M/c model without discrete event simulation.
+    Since all clients are served in FIFO order, the waiting times can be calculated directly from the arrival and service times (queue departure computation, see queuesim.qdc).
+
+    Args:
+        mean_i (float): Average inter-arrival time (E[I])
+        mean_s (float): Average service time (E[S])
+        c (int): Number of operators (c)
+        count (int): Client arrivals to be simulated
+
+    Returns:
+        dict: Input parameters, statistics of the waiting, service and residence times of the clients and the time averaged values E[N_Q], E[N] and rho
+    """
+    import numpy as np  # Imported here, so the other models can be used without NumPy (PyPy)
+    from .qdc import qdc_waiting_times
+
+    # Generate arrival and service times
+    rng = np.random.default_rng()
+    arrivals = rng.exponential(mean_i, count)
+    np.cumsum(arrivals, out=arrivals)
+    services = rng.exponential(mean_s, count)
+
+    # Calculate waiting times
+    waiting = qdc_waiting_times(arrivals, services, c)
+    residence = waiting + services
+    end_time: float = np.max(arrivals + residence) if count > 0 else 0
+
+    # Collect statistics
+    statistics = {}
+    for name, values in (('Waiting', waiting), ('Service', services), ('Residence', residence)):
+        statistics[name] = RecordDiscrete()
+        statistics[name].record_batch(values)
+
+    return {
+        'Waiting': statistics['Waiting'], 'Service': statistics['Service'], 'Residence': statistics['Residence'],
+        'E[N_Q]': np.sum(waiting) / end_time if end_time > 0 else 0,
+        'E[N]': np.sum(residence) / end_time if end_time > 0 else 0,
+        'rho': np.sum(services) / end_time / c if end_time > 0 else 0,
+        'meanI': mean_i, 'meanS': mean_s, 'c': c}
+
+
 def impatience_and_retry_model_build(mean_i: float, mean_s: float, mean_wt: float, retry_probability: float, mean_retry_delay: float, c: int, count: int) -> dict:
     """Generates a M/M/c + M model with impatience.
 
@@ -153,21 +201,72 @@ def build_network_model(sources: list, processes: list, disposes: list, connecti
         row = connections2[p_index]
         if len(row) > len(processes) + len(disposes): raise RuntimeError("connections2 column count does mot match sum of number of processes and numer of dispose stations")
 
-        if sum([1 for i in row if i > 0]) == 1:
+        next_stations: list = [(processes[next_index] if next_index < len(processes) else disposes[next_index - len(processes)], rate) for next_index, rate in enumerate(row) if rate > 0]
+
+        if len(next_stations) == 1:
             # Only one connection
-            for next_index, rate in enumerate(row):
-                if rate > 0:
-                    process.set_next(processes[next_index])
+            process.set_next(next_stations[0][0])
         else:
             # Multiple connections, use decide station
             decide: Decide = Decide(simulator)
             process.set_next(decide)
-            for next_index, rate in enumerate(row):
-                if rate <= 0: continue
-                if next_index < len(processes):
-                    decide.add_next(processes[next_index], rate)
-                else:
-                    decide.add_next(disposes[next_index - len(processes)], rate)
+            for next_station, rate in next_stations: decide.add_next(next_station, rate)
+
+
+def split_network_model(connections1: list, connections2: list) -> list:
+    """Splits a network defined by the transition rate matrices of build_network_model into its independent sub-networks.
+    Clients can never move from one sub-network to another one, so each sub-network can be built in a model of its own and all of them can be simulated in parallel (see run_parallel).
+    Dispose stations have no outgoing connections, so they do not connect sub-networks. A dispose station reached from several sub-networks is included in each of them (so each sub-model gets its own dispose station and the statistics of the original dispose station are split between them).
+
+    Args:
+        connections1 (list[list[float]]): Matrix of size number of sources x number of processes defining the transition rates from the sources to the process stations
+        connections2 (list[list[float]]): Matrix of size number of processes x (number of processes + number of disposes) defining the transition rates from the process stations to the process stations or the dispose stations
+
+    Returns:
+        list[tuple[list[int], list[int], list[int], list[list[float]], list[list[float]]]]: One tuple per sub-network containing the indices of the sources, of the process stations and of the dispose stations in the sub-network and the two transition rate matrices for build_network_model restricted to these stations. Stations which cannot be reached from any source are not included.
+    """
+    source_count: int = len(connections1)
+    process_count: int = len(connections2)
+
+    # Union-find over the sources and the process stations
+    parent: list = list(range(source_count + process_count))
+
+    def find(node: int) -> int:
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    for s_index, row in enumerate(connections1):
+        for p_index, rate in enumerate(row):
+            if rate > 0: parent[find(s_index)] = find(source_count + p_index)
+    for p_index, row in enumerate(connections2):
+        for next_index, rate in enumerate(row[:process_count]):
+            if rate > 0: parent[find(source_count + p_index)] = find(source_count + next_index)
+
+    # Collect the stations per sub-network (in the order of the first source of each sub-network)
+    components: dict = {}
+    for s_index in range(source_count): components.setdefault(find(s_index), ([], [], []))[0].append(s_index)
+    for p_index in range(process_count):
+        root = find(source_count + p_index)
+        if root in components: components[root][1].append(p_index)
+    for p_index, row in enumerate(connections2):
+        root = find(source_count + p_index)
+        if root not in components: continue
+        d_indices: list = components[root][2]
+        for d_index, rate in enumerate(row[process_count:]):
+            if rate > 0 and d_index not in d_indices: d_indices.append(d_index)
+    for s_indices, p_indices, d_indices in components.values(): d_indices.sort()
+
+    # Restrict the transition rate matrices to the stations of each sub-network
+    result: list = []
+    for s_indices, p_indices, d_indices in components.values():
+        next_indices = p_indices + [process_count + d_index for d_index in d_indices]
+        sub1 = [[connections1[s_index][p_index] if p_index < len(connections1[s_index]) else 0 for p_index in p_indices] for s_index in s_indices]
+        sub2 = [[connections2[p_index][next_index] if next_index < len(connections2[p_index]) else 0 for next_index in next_indices] for p_index in p_indices]
+        result.append((s_indices, p_indices, d_indices, sub1, sub2))
+
+    return result
 
 
 def mmc_results(model: dict) -> str:
@@ -186,23 +285,23 @@ def mmc_results(model: dict) -> str:
     results = []
 
     results.append("System")
-    results.append("  Simulated arrivals: " + str(source.count))
-    results.append("  Inter-arrival times at the system (I): " + source.statistic.info)
-    results.append("  Inter-departure times from the system (ID): " + dispose.statistic.info)
+    results.append(f"  Simulated arrivals: {source.count}")
+    results.append(f"  Inter-arrival times at the system (I): {source.statistic.info}")
+    results.append(f"  Inter-departure times from the system (ID): {dispose.statistic.info}")
     results.append("")
 
     results.append("Process station")
-    results.append("  Waiting times (W): " + process.statistic_station_waiting.info)
-    results.append("  Service times (S): " + process.statistic_station_service.info)
-    results.append("  Queue length (NQ): " + process.statistic_queue_length.info)
-    results.append("  Clients at the station (N): " + process.statistic_wip.info)
-    results.append("  Work load (rho*c): " + process.statistic_workload.info)
+    results.append(f"  Waiting times (W): {process.statistic_station_waiting.info}")
+    results.append(f"  Service times (S): {process.statistic_station_service.info}")
+    results.append(f"  Queue length (NQ): {process.statistic_queue_length.info}")
+    results.append(f"  Clients at the station (N): {process.statistic_wip.info}")
+    results.append(f"  Work load (rho*c): {process.statistic_workload.info}")
     results.append("")
 
     results.append("Clients")
-    results.append("  Waiting times (W): " + dispose.statistic_client_waiting.info)
-    results.append("  Service times (S): " + dispose.statistic_client_service.info)
-    results.append("  Residence times (V): " + dispose.statistic_client_residence.info)
+    results.append(f"  Waiting times (W): {dispose.statistic_client_waiting.info}")
+    results.append(f"  Service times (S): {dispose.statistic_client_service.info}")
+    results.append(f"  Residence times (V): {dispose.statistic_client_residence.info}")
 
     return "\n".join(results)
 
@@ -225,101 +324,101 @@ def call_center_results(source: Source, process: Process, forwarding: Optional[D
 
     if not isinstance(lang, str) or lang.lower() != "de":
         results.append("System")
-        results.append("  Simulated arrivals: " + str(source.count))
-        results.append("  Inter-arrival times at the system (I): " + str(source.statistic))
-        results.append("  Inter-departure times from the system (ID): " + str(dispose.statistic))
+        results.append(f"  Simulated arrivals: {source.count}")
+        results.append(f"  Inter-arrival times at the system (I): {source.statistic}")
+        results.append(f"  Inter-departure times from the system (ID): {dispose.statistic}")
         results.append("")
 
         results.append("Process station")
-        results.append("  Success rate: " + str(process.statistic_success))
-        results.append("  Waiting times (W): " + str(process.statistic_station_waiting))
-        results.append("  Service times (S): " + str(process.statistic_station_service))
-        if process.statistic_station_post_processing.count > 0: results.append("  Nachbearbeitungszeiten (S2): " + str(process.statistic_station_post_processing))
-        results.append("  Queue length (NQ): " + str(process.statistic_queue_length))
-        results.append("  Clients at the station (N): " + str(process.statistic_wip))
-        results.append("  Work load (c*rho): " + str(process.statistic_workload))
+        results.append(f"  Success rate: {process.statistic_success}")
+        results.append(f"  Waiting times (W): {process.statistic_station_waiting}")
+        results.append(f"  Service times (S): {process.statistic_station_service}")
+        if process.statistic_station_post_processing.count > 0: results.append(f"  Nachbearbeitungszeiten (S2): {process.statistic_station_post_processing}")
+        results.append(f"  Queue length (NQ): {process.statistic_queue_length}")
+        results.append(f"  Clients at the station (N): {process.statistic_wip}")
+        results.append(f"  Work load (c*rho): {process.statistic_workload}")
         results.append("")
 
         results.append("Clients")
-        results.append("  Waiting times (W): " + str(dispose.statistic_client_waiting))
-        results.append("  Service times (S): " + str(dispose.statistic_client_service))
-        results.append("  Residence times (V): " + str(dispose.statistic_client_residence))
+        results.append(f"  Waiting times (W): {dispose.statistic_client_waiting}")
+        results.append(f"  Service times (S): {dispose.statistic_client_service}")
+        results.append(f"  Residence times (V): {dispose.statistic_client_residence}")
         results.append("")
 
         if forwarding is not None and len(forwarding.statistic_options.data) > 1:
             results.append("Forwarding")
-            results.append("  " + str(forwarding.statistic_options))
+            results.append(f"  {forwarding.statistic_options}")
             results.append("  Exit 1 = Dispose")
             results.append("  Exit 2 = Forwarding back to process station")
             results.append("")
 
         if retry is not None and retry.statistic_options.count > 0:
             results.append("Retry")
-            results.append("  " + str(retry.statistic_options))
+            results.append(f"  {retry.statistic_options}")
             results.append("  Exit 1 = Final cancelation")
             results.append("  Exit 2 = Retry")
             results.append("")
 
         if delay is not None and delay.statistic.count > 0:
             results.append("Delay before retry")
-            results.append("  Clients at the station (N): " + str(delay.statistic_wip))
-            results.append("  Residence times (V): " + str(delay.statistic_station_residence))
+            results.append(f"  Clients at the station (N): {delay.statistic_wip}")
+            results.append(f"  Residence times (V): {delay.statistic_station_residence}")
             results.append("")
 
         results.append("Simulator")
-        results.append("  Total computing time: " + str(round(simulator.run_time, 1)) + " seconds")
-        results.append("  Computing time per client: " + str(round(simulator.run_time / source.count * 1000 * 1000, 1)) + " µs")
-        results.append("  Computing time per event: " + str(round(simulator.run_time / simulator.event_count * 1000 * 1000, 1)) + " µs")
-        results.append("  Simulated events: " + str(simulator.event_count))
+        results.append(f"  Total computing time: {round(simulator.run_time, 1)} seconds")
+        results.append(f"  Computing time per client: {round(simulator.run_time / source.count * 1000 * 1000, 1)} µs")
+        results.append(f"  Computing time per event: {round(simulator.run_time / simulator.event_count * 1000 * 1000, 1)} µs")
+        results.append(f"  Simulated events: {simulator.event_count}")
         results.append("")
     else:
         results.append("System")
-        results.append("  Simulierte Ankünfte: " + str(source.count))
-        results.append("  Zwischenankunftszeiten am System (I): " + str(source.statistic))
-        results.append("  Zwischenabgangszeiten aus dem System (ID): " + str(dispose.statistic))
+        results.append(f"  Simulierte Ankünfte: {source.count}")
+        results.append(f"  Zwischenankunftszeiten am System (I): {source.statistic}")
+        results.append(f"  Zwischenabgangszeiten aus dem System (ID): {dispose.statistic}")
         results.append("")
 
         results.append("Bedienstation")
-        results.append("  Erfolgsquote: " + str(process.statistic_success))
-        results.append("  Wartezeit (W): " + str(process.statistic_station_waiting))
-        results.append("  Bedienzeit (S): " + str(process.statistic_station_service))
-        if process.statistic_station_post_processing.count > 0: results.append("  Nachbearbeitungszeiten (S2): " + str(process.statistic_station_post_processing))
-        results.append("  Warteschlangenlänge (NQ): " + str(process.statistic_queue_length))
-        results.append("  Kunden an Station (N): " + str(process.statistic_wip))
-        results.append("  Auslastung (c*rho): " + str(process.statistic_workload))
+        results.append(f"  Erfolgsquote: {process.statistic_success}")
+        results.append(f"  Wartezeit (W): {process.statistic_station_waiting}")
+        results.append(f"  Bedienzeit (S): {process.statistic_station_service}")
+        if process.statistic_station_post_processing.count > 0: results.append(f"  Nachbearbeitungszeiten (S2): {process.statistic_station_post_processing}")
+        results.append(f"  Warteschlangenlänge (NQ): {process.statistic_queue_length}")
+        results.append(f"  Kunden an Station (N): {process.statistic_wip}")
+        results.append(f"  Auslastung (c*rho): {process.statistic_workload}")
         results.append("")
 
         results.append("Kunden")
-        results.append("  Wartezeit (W): " + str(dispose.statistic_client_waiting))
-        results.append("  Bedienzeit (S): " + str(dispose.statistic_client_service))
-        results.append("  Verweilzteit (V): " + str(dispose.statistic_client_residence))
+        results.append(f"  Wartezeit (W): {dispose.statistic_client_waiting}")
+        results.append(f"  Bedienzeit (S): {dispose.statistic_client_service}")
+        results.append(f"  Verweilzteit (V): {dispose.statistic_client_residence}")
         results.append("")
 
         if forwarding is not None and len(forwarding.statistic_options.data) > 1:
             results.append("Weiterleitungen")
-            results.append("  " + str(forwarding.statistic_options))
+            results.append(f"  {forwarding.statistic_options}")
             results.append("  Ausgang 1 = Ende")
             results.append("  Ausgang 2 = Weiterleitung zurück zur Bedienstation")
             results.append("")
 
         if retry is not None and retry.statistic_options.count > 0:
             results.append("Wiederholungen")
-            results.append("  " + str(retry.statistic_options))
+            results.append(f"  {retry.statistic_options}")
             results.append("  Ausgang 1 = Finaler Abbruch")
             results.append("  Ausgang 2 = Neuer Versuch")
             results.append("")
 
         if delay is not None and delay.statistic.count > 0:
             results.append("Verzögerung vor Wiederholungen")
-            results.append("  Kunden an Station (N): " + str(delay.statistic_wip))
-            results.append("  Verweilzeit (V): " + str(delay.statistic_station_residence))
+            results.append(f"  Kunden an Station (N): {delay.statistic_wip}")
+            results.append(f"  Verweilzeit (V): {delay.statistic_station_residence}")
             results.append("")
 
         results.append("Simulator")
-        results.append("  Rechenzeit gesamt: " + str(round(simulator.run_time, 1)) + " Sekunden")
-        results.append("  Rechenzeit pro Kunde: " + str(round(simulator.run_time / source.count * 1000 * 1000, 1)) + " µs")
-        results.append("  Rechenzeit pro Ereignis: " + str(round(simulator.run_time / simulator.event_count * 1000 * 1000, 1)) + " µs")
-        results.append("  Simulierte Ereignisse: " + str(simulator.event_count))
+        results.append(f"  Rechenzeit gesamt: {round(simulator.run_time, 1)} Sekunden")
+        results.append(f"  Rechenzeit pro Kunde: {round(simulator.run_time / source.count * 1000 * 1000, 1)} µs")
+        results.append(f"  Rechenzeit pro Ereignis: {round(simulator.run_time / simulator.event_count * 1000 * 1000, 1)} µs")
+        results.append(f"  Simulierte Ereignisse: {simulator.event_count}")
         results.append("")
 
     return "\n".join(results)
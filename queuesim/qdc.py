@@ -0,0 +1,117 @@
+"""Queue departure computation (QDC) for FIFO G/G/c systems without discrete event simulation."""
+
+import heapq
+from functools import lru_cache
+from typing import Callable
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+    prange = range
+
+
+__title__ = "queuesim"
+__version__ = "1.0"
+__author__ = "Alexander Herzog"
+__email__ = "alexander.herzog@tu-clausthal.de"
+__copyright__ = """
+Copyright 2022 Alexander Herzog
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+__license__ = "Apache 2.0"
+
+
+def _qdc_waiting_heap(arrivals: np.ndarray, services: np.ndarray, c: int) -> np.ndarray:
+    server_free_at: list = [0.0] * c  # Heap of the times when the servers become idle
+    waiting: list = []
+    for time, service in zip(arrivals.tolist(), services.tolist()):
+        start: float = max(time, server_free_at[0])
+        waiting.append(start - time)
+        heapq.heapreplace(server_free_at, start + service)
+    return np.array(waiting)
+
+
+def _qdc_waiting_argmin(arrivals: np.ndarray, services: np.ndarray, c: int) -> np.ndarray:
+    server_free_at = np.zeros(c)
+    waiting = np.empty(arrivals.shape[0])
+    for k in range(arrivals.shape[0]):
+        index = np.argmin(server_free_at)
+        start = max(arrivals[k], server_free_at[index])
+        waiting[k] = start - arrivals[k]
+        server_free_at[index] = start + services[k]
+    return waiting
+
+
+_qdc_waiting = njit("float64[::1](float64[::1], float64[::1], int64)", cache=True)(_qdc_waiting_argmin) if njit is not None else _qdc_waiting_heap
+
+
+def qdc_waiting_times(arrivals: np.ndarray, services: np.ndarray, c: int) -> np.ndarray:
+    """Calculates the waiting times of the clients in a FIFO system with c operators directly from the arrival and service times.
+
+    Args:
+        arrivals (np.ndarray): Absolute arrival times (sorted ascending)
+        services (np.ndarray): Service times of the clients
+        c (int): Number of operators
+
+    Returns:
+        np.ndarray: Waiting times of the clients
+    """
+    return _qdc_waiting(np.ascontiguousarray(arrivals, dtype=np.float64), np.ascontiguousarray(services, dtype=np.float64), int(c))
+
+
+def _qdc_mean_waiting_loop(arrivals: np.ndarray, services: np.ndarray, c_values: np.ndarray) -> np.ndarray:
+    mean_waiting = np.empty(c_values.shape[0])
+    for k in prange(c_values.shape[0]):  # One thread per number of operators (if compiled by Numba)
+        mean_waiting[k] = np.mean(_qdc_waiting(arrivals, services, c_values[k]))
+    return mean_waiting
+
+
+_qdc_mean_waiting = njit("float64[::1](float64[::1], float64[::1], int64[::1])", parallel=True, cache=True)(_qdc_mean_waiting_loop) if njit is not None else _qdc_mean_waiting_loop
+
+
+def qdc_mean_waiting_times(arrivals: np.ndarray, services: np.ndarray, c_values) -> np.ndarray:
+    """Calculates the mean waiting times of the clients for several numbers of operators (using the same arrival and service times for all of them).
+    If Numba is available, the systems are calculated in parallel threads.
+
+    Args:
+        arrivals (np.ndarray): Absolute arrival times (sorted ascending)
+        services (np.ndarray): Service times of the clients
+        c_values: Numbers of operators (sequence of int)
+
+    Returns:
+        np.ndarray: Mean waiting time for each number of operators
+    """
+    return _qdc_mean_waiting(np.ascontiguousarray(arrivals, dtype=np.float64), np.ascontiguousarray(services, dtype=np.float64), np.ascontiguousarray(c_values, dtype=np.int64))
+
+
+@lru_cache(maxsize=None)
+def build_mmc_runner(count: int) -> Callable[[float, float, int], tuple]:
+    """Generates a function which simulates an M/M/c model with a fixed number of arrivals (using the queue departure computation).
+    The number of arrivals is a constant of the generated function, so if Numba is available, a kernel specialized for this number is compiled (once per value of count). The compiled kernel releases the global interpreter lock, so it can be called from several threads at the same time.
+
+    Args:
+        count (int): Number of arrivals to be simulated
+
+    Returns:
+        Callable[[float, float, int], tuple]: Function taking E[I], E[S] and c and returning the mean waiting time and the time when the last client leaves the system
+    """
+    def run_mmc(mean_i: float, mean_s: float, c: int) -> tuple:
+        arrivals = np.cumsum(np.random.exponential(mean_i, count))
+        services = np.random.exponential(mean_s, count)
+        waiting = _qdc_waiting(arrivals, services, c)
+        return np.mean(waiting), np.max(arrivals + waiting + services)
+
+    return njit(nogil=True)(run_mmc) if njit is not None else run_mmc
@@ -1,8 +1,11 @@
 """Functions for generating lambdas that produce pseudorandom numbers according to certain distributions."""
 
-from typing import Callable, Union
+from typing import Any, Callable, Optional, Union
+from bisect import bisect_left
+from itertools import accumulate
 import math
 import random
+from ._compat import np, USE_NUMPY
 
 
 __title__ = "queuesim"
@@ -27,6 +30,43 @@ limitations under the License.
 __license__ = "Apache 2.0"
 
 
+_CHUNK_SIZE: int = 8192  # 64 KB of doubles per buffer
+
+_rng: Any = np.random.default_rng() if USE_NUMPY else None
+
+
+def seed(value: Union[int, None] = None) -> None:
+    """Reinitializes the pseudorandom number generators used by the generated lambda expressions and strings.
+
+    Args:
+        value (Union[int, None], optional): Seed (None means: fresh entropy from the operating system). Defaults to None.
+    """
+    global _rng
+    random.seed(value)
+    if USE_NUMPY: _rng = np.random.default_rng(value)
+
+
+def _buffered(draw_chunk: Callable[[int], Any], draw_single: Callable[[], float]) -> Callable[[], float]:
+    """Generates a lambda expression which returns the pseudorandom numbers from a buffer which is refilled in chunks by NumPy.
+
+    Args:
+        draw_chunk (Callable[[int], Any]): Function returning a NumPy array of the given number of pseudorandom numbers
+        draw_single (Callable[[], float]): Function returning a single pseudorandom number (used if NumPy is not available)
+
+    Returns:
+        Callable[[], float]: Lambda expression for random number generator
+    """
+    if not USE_NUMPY: return draw_single
+
+    buffer: list = []
+
+    def draw() -> float:
+        if not buffer: buffer.extend(draw_chunk(_CHUNK_SIZE).tolist())
+        return buffer.pop()
+
+    return draw
+
+
 def exp(mean: float, as_lambda: bool = False) -> Union[str, Callable[[], float]]:
     """Generates a lambda expression or a string that can be evaluated to a lambda expression, with a pseudorandom number generator for the exponential distribution
 
@@ -38,10 +78,79 @@ def exp(mean: float, as_lambda: bool = False) -> Union[str, Callable[[], float]]
         Union[str, Callable[[], float]]: Lambda expression or string with lambda expression for random number generator
     """
     assert mean > 0
+    rate: float = 1 / mean  # Calculated once instead of on every call
     if as_lambda:
-        return lambda: random.expovariate(1 / mean)
+        return _buffered(lambda size: _rng.exponential(mean, size), lambda expovariate=random.expovariate: expovariate(rate))
+    else:
+        return "lambda: random.expovariate(" + str(rate) + ")"
+
+
+class _ExpStream:
+    """Picklable pseudorandom number generator for the exponential distribution with its own random number stream.
+    Unlike a closure it can be passed to a worker process (e.g. by `run_parallel`).
+    """
+    __slots__ = ("__mean", "__generator", "__buffer")
+
+    def __init__(self, mean: float, seed: int) -> None:
+        """Constructor
+
+        Args:
+            mean (float): Mean = standard deviation
+            seed (int): Seed of the random number stream
+        """
+        self.__mean: float = mean
+        self.__generator: Any = np.random.default_rng(seed) if USE_NUMPY else random.Random(seed)
+        self.__buffer: list = []
+
+    def __call__(self) -> float:
+        if not USE_NUMPY: return self.__generator.expovariate(1 / self.__mean)
+        if not self.__buffer: self.__buffer = self.__generator.exponential(self.__mean, _CHUNK_SIZE).tolist()
+        return self.__buffer.pop()
+
+
+def exp_stream(mean: float, seed: int) -> Callable[[], float]:
+    """Generates a lambda expression with a pseudorandom number generator for the exponential distribution, which uses its own random number stream initialized by the given seed.
+    All lambdas generated with the same seed return the same sequence of values (common random numbers), independent of the other random numbers drawn in the process.
+
+    Args:
+        mean (float): Mean = standard deviation
+        seed (int): Seed of the random number stream
+
+    Returns:
+        Callable[[], float]: Lambda expression for random number generator
+    """
+    assert mean > 0
+    return _ExpStream(mean, seed)
+
+
+def exp_bulk(mean: float, count: int, seed: Optional[int] = None) -> Callable[[], float]:
+    """Generates a lambda expression which returns a fixed number of exponentially distributed pseudorandom numbers, which are all drawn at once in advance.
+    The lambda expression can be pickled (so it can be used in models which are simulated in other processes), but it can only be used for one simulation run.
+
+    Args:
+        mean (float): Mean = standard deviation
+        count (int): Number of values which will be requested
+        seed (Optional[int], optional): If not None, the values are drawn from an own random number stream initialized by this seed. Defaults to None.
+
+    Returns:
+        Callable[[], float]: Lambda expression returning the pregenerated values one after another
+    """
+    assert mean > 0
+    if not USE_NUMPY:
+        expovariate = (random if seed is None else random.Random(seed)).expovariate
+        rate: float = 1 / mean
+        values: list = [expovariate(rate) for _ in range(count)]
     else:
-        return "lambda: random.expovariate(1/" + str(mean) + ")"
+        generator = _rng if seed is None else np.random.default_rng(seed)
+        values: list = generator.exponential(mean, count).tolist()
+    return iter(values).__next__
+
+
+def _log_normal_parameters(mean: float, std: float) -> tuple:
+    assert std >= 0
+    mu: float = math.log(mean**2 / math.sqrt(std**2 + mean**2))
+    sigma: float = math.sqrt(math.log((std**2 / mean**2) + 1))
+    return (mu, sigma)
 
 
 def log_normal(mean: float, std: float, as_lambda: bool = False) -> Union[str, Callable[[], float]]:
@@ -55,15 +164,21 @@ def log_normal(mean: float, std: float, as_lambda: bool = False) -> Union[str, C
     Returns:
         Union[str, Callable[[], float]]: Lambda expression or string with lambda expression for random number generator
     """
-    assert std >= 0
-    mu: float = math.log(mean**2 / math.sqrt(std**2 + mean**2))
-    sigma: float = math.sqrt(math.log((std**2 / mean**2) + 1))
+    mu, sigma = _log_normal_parameters(mean, std)
     if as_lambda:
-        return lambda: random.lognormvariate(mu, sigma)
+        return _buffered(lambda size: _rng.lognormal(mu, sigma, size), lambda lognormvariate=random.lognormvariate: lognormvariate(mu, sigma))
     else:
         return "lambda: random.lognormvariate(" + str(mu) + ", " + str(sigma) + ")"
 
 
+def _gamma_parameters(mean: float, std: float) -> tuple:
+    assert std >= 0
+    beta: float = mean / (std * std)
+    alpha: float = mean * beta
+    beta: float = 1 / beta
+    return (alpha, beta)
+
+
 def gamma(mean: float, std: float, as_lambda: bool = False) -> Union[str, Callable[[], float]]:
     """Generates a lambda expression or a string that can be evaluated to a lambda expression, with a pseudorandom number generator for the gamma distribution
 
@@ -75,12 +190,9 @@ def gamma(mean: float, std: float, as_lambda: bool = False) -> Union[str, Callab
     Returns:
         Union[str, Callable[[], float]]: Lambda expression or string with lambda expression for random number generator
     """
-    assert std >= 0
-    beta: float = mean / (std * std)
-    alpha: float = mean * beta
-    beta: float = 1 / beta
+    alpha, beta = _gamma_parameters(mean, std)
     if as_lambda:
-        return lambda: random.gammavariate(alpha, beta)
+        return _buffered(lambda size: _rng.gamma(alpha, beta, size), lambda gammavariate=random.gammavariate: gammavariate(alpha, beta))
     else:
         return "lambda: random.gammavariate(" + str(alpha) + ", " + str(beta) + ")"
 
@@ -97,7 +209,7 @@ def uniform(low: float, high: float, as_lambda: bool = False) -> Union[str, Call
         Union[str, Callable[[], float]]: Lambda expression or string with lambda expression for random number generator
     """
     if as_lambda:
-        return lambda: random.uniform(low, high)
+        return _buffered(lambda size: _rng.uniform(low, high, size), lambda uniform=random.uniform: uniform(low, high))
     else:
         return "lambda: random.uniform(" + str(low) + ", " + str(high) + ")"
 
@@ -115,7 +227,8 @@ def triangular(low: float, most_likely: float, high: float, as_lambda: bool = Fa
         Union[str, Callable[[], float]]: Lambda expression or string with lambda expression for random number generator
     """
     if as_lambda:
-        return lambda: random.triangular(low, high, most_likely)
+        if low >= high: return lambda triangular=random.triangular: triangular(low, high, most_likely)
+        return _buffered(lambda size: _rng.triangular(low, most_likely, high, size), lambda triangular=random.triangular: triangular(low, high, most_likely))
     else:
         return "lambda: random.triangular(" + str(low) + ", " + str(high) + ", " + str(most_likely) + ")"
 
@@ -137,13 +250,14 @@ def deterministic(mean: float, as_lambda: bool = False) -> Union[str, Callable[[
 
 
 def empirical_helper(values: dict) -> float:
-    rate_sum: float = sum(values.values())
-    rnd: float = random.random() * rate_sum
-    s: float = 0
-    for key in values:
-        s += values[key]
-        if s >= rnd: return key
-    return 0
+    if not values: return 0
+    cum: list = list(accumulate(values.values()))
+    return tuple(values)[bisect_left(cum, random.random() * cum[-1])]
+
+
+def _empirical_table(values: dict) -> tuple:
+    cum: list = list(accumulate(values.values()))
+    return (tuple(values), cum, cum[-1])
 
 
 def empirical(values: dict, as_lambda: bool = False) -> Union[str, Callable[[], float]]:
@@ -156,7 +270,108 @@ def empirical(values: dict, as_lambda: bool = False) -> Union[str, Callable[[],
     Returns:
         Union[str, Callable[[], float]]: Lambda expression or string with lambda expression for random number generator
     """
+    if not values: return deterministic(0, as_lambda)
+
+    # Cumulative rates are calculated only once, so each value can be drawn by a binary search
+    keys, cum, rate_sum = _empirical_table(values)
     if as_lambda:
-        return lambda: empirical_helper(values)
+        return lambda rnd=random.random: keys[bisect_left(cum, rnd() * rate_sum)]
     else:
-        return "lambda: empirical_helper(" + str(values) + ")"
+        # bisect_left is bound as a default argument, so the string does not depend on the imports of the module evaluating it
+        return "lambda keys=" + str(keys) + ", cum=" + str(cum) + ", bisect_left=__import__('bisect').bisect_left: keys[bisect_left(cum, random.random() * " + str(rate_sum) + ")]"
+
+
+def _array(draw_array: Callable[[], Any], draw_single: Callable[[], float], count: int) -> Any:
+    if not USE_NUMPY: return [draw_single() for _ in range(count)]
+    return draw_array()
+
+
+def exp_array(mean: float, count: int) -> Any:
+    """Draws a number of pseudorandom numbers according to the exponential distribution at once.
+
+    Args:
+        mean (float): Mean = standard deviation
+        count (int): Number of values
+
+    Returns:
+        np.ndarray: Pseudorandom numbers (list if NumPy is not available)
+    """
+    assert mean > 0
+    return _array(lambda: _rng.exponential(mean, count), lambda: random.expovariate(1 / mean), count)
+
+
+def log_normal_array(mean: float, std: float, count: int) -> Any:
+    """Draws a number of pseudorandom numbers according to the log-normal distribution at once.
+
+    Args:
+        mean (float): Mean
+        std (float): Standard deviation
+        count (int): Number of values
+
+    Returns:
+        np.ndarray: Pseudorandom numbers (list if NumPy is not available)
+    """
+    mu, sigma = _log_normal_parameters(mean, std)
+    return _array(lambda: _rng.lognormal(mu, sigma, count), lambda: random.lognormvariate(mu, sigma), count)
+
+
+def gamma_array(mean: float, std: float, count: int) -> Any:
+    """Draws a number of pseudorandom numbers according to the gamma distribution at once.
+
+    Args:
+        mean (float): Mean
+        std (float): Standard deviation
+        count (int): Number of values
+
+    Returns:
+        np.ndarray: Pseudorandom numbers (list if NumPy is not available)
+    """
+    alpha, beta = _gamma_parameters(mean, std)
+    return _array(lambda: _rng.gamma(alpha, beta, count), lambda: random.gammavariate(alpha, beta), count)
+
+
+def uniform_array(low: float, high: float, count: int) -> Any:
+    """Draws a number of pseudorandom numbers according to the uniform distribution at once.
+
+    Args:
+        low (float): Minimum value of the support
+        high (float): Maximum value of the support
+        count (int): Number of values
+
+    Returns:
+        np.ndarray: Pseudorandom numbers (list if NumPy is not available)
+    """
+    return _array(lambda: _rng.uniform(low, high, count), lambda: random.uniform(low, high), count)
+
+
+def triangular_array(low: float, most_likely: float, high: float, count: int) -> Any:
+    """Draws a number of pseudorandom numbers according to the triangular distribution at once.
+
+    Args:
+        low (float): Minimum value of the support
+        most_likely (float): x value of the highest density
+        high (float): Maximum value of the support
+        count (int): Number of values
+
+    Returns:
+        np.ndarray: Pseudorandom numbers (list if NumPy is not available)
+    """
+    draw_single = lambda: random.triangular(low, high, most_likely)
+    if low >= high: return _array(lambda: np.array([draw_single() for _ in range(count)]), draw_single, count)  # NumPy needs low < high
+    return _array(lambda: _rng.triangular(low, most_likely, high, count), draw_single, count)
+
+
+def empirical_array(values: dict, count: int) -> Any:
+    """Draws a number of pseudorandom numbers according to an empirical distribution at once.
+
+    Args:
+        values (dict[float, float]): A dict containing pairs: value -> rate
+        count (int): Number of values
+
+    Returns:
+        np.ndarray: Pseudorandom numbers (list if NumPy is not available)
+    """
+    if not values: return _array(lambda: np.zeros(count), lambda: 0, count)
+    keys, cum, rate_sum = _empirical_table(values)
+    # All values are looked up by one vectorized binary search over the cumulative rates
+    return _array(lambda: np.array(keys)[np.searchsorted(cum, _rng.random(count) * rate_sum)], lambda: keys[bisect_left(cum, random.random() * rate_sum)], count)
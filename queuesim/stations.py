@@ -1,6 +1,8 @@
 """Classes for modelling the stations of a queueing model"""
 
 from typing import Any, Optional
+from bisect import bisect_left
+from functools import lru_cache
 import random
 from .descore import Event, Simulator
 from .statistics import RecordDiscrete, RecordContinuous, RecordOptions
@@ -49,6 +51,16 @@ class _SendEvent(Event):
         self.__station.arrival(self.__client)
 
 
+@lru_cache(maxsize=None)
+def _compile_lambda(text: str) -> Any:
+    return compile(text, "<lambda>", "eval")
+
+
+def _eval_lambda(text: str) -> Any:
+    # Each distinct lambda string is parsed only once (stations using the same distribution and repeated runs reuse the code object)
+    return eval(_compile_lambda(text))
+
+
 class Client:
     """Client object."""
     __slots__ = ("__simulator", "__type_name", "__waitingTime", "__serviceTime", "stationArrivalTime", "removeEvent")
@@ -171,6 +183,11 @@ class Station:
         """Invoked by the simulator system at the beginning of event processing."""
         pass
 
+    def reset(self) -> None:
+        """Resets the state and the statistics of the station, so the model can be simulated again (invoked by Simulator.reset)."""
+        self.__lastArrivalTime = 0
+        self.__statistic = RecordDiscrete()
+
     def arrival(self, client: Client) -> None:
         """Notifies the station that a client has arrived.
 
@@ -269,7 +286,7 @@ class Source(Station):
     def _schedule_next_arrival(self) -> None:
         if self.__count >= self.__toBeSimulated: return
         self.__count += 1
-        if isinstance(self.__getI, str): self.__getI = eval(self.__getI)
+        if isinstance(self.__getI, str): self.__getI = _eval_lambda(self.__getI)
         if self.__getI is not None: self.generate_event(self.__getI())
 
     def arrival(self, client: Client) -> None:
@@ -277,7 +294,7 @@ class Source(Station):
         client.send_to(self.__nextStation)
 
     def event(self, client: Optional[Client]) -> None:
-        if isinstance(self.__getB, str): self.__getB = eval(self.__getB)
+        if isinstance(self.__getB, str): self.__getB = _eval_lambda(self.__getB)
         b = self.__getB() if self.__getB is not None else 1
         for i in range(0, b): self.arrival(Client(self.simulator, self.__type_name))
         self._schedule_next_arrival()
@@ -310,6 +327,10 @@ class Source(Station):
         if self.__nextStation is None: return []
         return [self.__nextStation]
 
+    def reset(self) -> None:
+        super().reset()
+        self.__count = 0
+
     def clear_lambdas(self) -> None:
         super().clear_lambdas()
         self.__getI = None
@@ -365,6 +386,12 @@ class Dispose(Station):
         """
         return self.__statisticClientResidence
 
+    def reset(self) -> None:
+        super().reset()
+        self.__statisticClientWaiting = RecordDiscrete()
+        self.__statisticClientService = RecordDiscrete()
+        self.__statisticClientResidence = RecordDiscrete()
+
     def clear_lambdas(self) -> None:
         super().clear_lambdas()
         self.__statisticClientWaiting.done_recording()
@@ -379,7 +406,7 @@ class _WaitingCancelationEvent(StationEvent):
 
 class Process(Station):
     """ Station: Process station."""
-    __slots__ = ("__getS", "__getS_client_type", "__getS2", "__getNu", "__getNu_client_type", "__c", "__cBusy", "__K", "__b", "__FIFO", "__wip", "__queue", "__nextStationCancel", "__statisticStationWaiting", "__statisticStationService", "__statisticStationPostProcessing", "__statisticStationResidence", "__statisticSuccess", "__statisticQueueLength", "__statisticWIP", "__statisticWorkload", "__nextStation")
+    __slots__ = ("__getS", "__getS_client_type", "__getS2", "__getNu", "__getNu_client_type", "__c", "__cBusy", "__K", "__b", "__FIFO", "__wip", "__queue", "__nextStationCancel", "__statisticStationWaiting", "__statisticStationService", "__statisticStationPostProcessing", "__statisticStationResidence", "__statisticSuccess", "__statisticQueueLength", "__statisticWIP", "__statisticWorkload", "__recordValues", "__nextStation")
 
     def __init__(self, simulator: Simulator, getS: Any, c: int, getNu: Any = None, getS2: Any = None, K: int = -1, b: int = 1, LIFO: bool = False, record_values: bool = False, getS_client_type: Any = None, getNu_client_type: Any = None) -> None:
         """ Station: Process station.
@@ -420,6 +447,7 @@ class Process(Station):
         self.__statisticQueueLength: RecordContinuous = RecordContinuous(record_values)
         self.__statisticWIP: RecordContinuous = RecordContinuous(record_values)
         self.__statisticWorkload: RecordContinuous = RecordContinuous(record_values)
+        self.__recordValues: bool = record_values
 
     def set_next(self, station: Station) -> None:
         """Sets the next station for successfully served clients.
@@ -482,11 +510,11 @@ class Process(Station):
         if self.__getNu_client_type is not None:
             client_type: str = client.type_name
             if client_type in self.__getNu_client_type:
-                if isinstance(self.__getNu_client_type[client_type], str): self.__getNu_client_type[client_type] = eval(self.__getNu_client_type[client_type])
+                if isinstance(self.__getNu_client_type[client_type], str): self.__getNu_client_type[client_type] = _eval_lambda(self.__getNu_client_type[client_type])
                 return max(0, self.__getNu_client_type[client_type])
 
         if self.__getNu is not None:
-            if isinstance(self.__getNu, str): self.__getNu = eval(self.__getNu)
+            if isinstance(self.__getNu, str): self.__getNu = _eval_lambda(self.__getNu)
             return max(0, self.__getNu())
 
         return 0
@@ -535,7 +563,7 @@ class Process(Station):
         return True
 
     def _get_service_time(self, clients: list) -> float:
-        if isinstance(self.__getS, str): self.__getS = eval(self.__getS)
+        if isinstance(self.__getS, str): self.__getS = _eval_lambda(self.__getS)
 
         if self.__getS_client_type is not None:
             client_types: set[str] = set()
@@ -545,7 +573,7 @@ class Process(Station):
             add_default: bool = False
             for client_type in client_types:
                 if client_type in self.__getS_client_type:
-                    if isinstance(self.__getS_client_type[client_type], str): self.__getS_client_type[client_type] = eval(self.__getS_client_type[client_type])
+                    if isinstance(self.__getS_client_type[client_type], str): self.__getS_client_type[client_type] = _eval_lambda(self.__getS_client_type[client_type])
                     time = max(time, self.__getS_client_type[client_type]())
                 else:
                     add_default = True
@@ -574,7 +602,7 @@ class Process(Station):
         if self.__getS2 is None:
             self._free_operator()
         else:
-            if isinstance(self.__getS2, str): self.__getS2 = eval(self.__getS2)
+            if isinstance(self.__getS2, str): self.__getS2 = _eval_lambda(self.__getS2)
             postProcessingTime: float = max(0, self.__getS2())
             self.__statisticStationPostProcessing.record(postProcessingTime)
             self.generate_event(postProcessingTime)
@@ -690,6 +718,20 @@ class Process(Station):
         if self.__nextStationCancel is not None: next.append(self.__nextStationCancel)
         return next
 
+    def reset(self) -> None:
+        super().reset()
+        self.__cBusy = 0
+        self.__wip = 0
+        self.__queue.clear()
+        self.__statisticStationWaiting = RecordDiscrete()
+        self.__statisticStationService = RecordDiscrete()
+        self.__statisticStationPostProcessing = RecordDiscrete()
+        self.__statisticStationResidence = RecordDiscrete()
+        self.__statisticSuccess = RecordOptions()
+        self.__statisticQueueLength = RecordContinuous(self.__recordValues)
+        self.__statisticWIP = RecordContinuous(self.__recordValues)
+        self.__statisticWorkload = RecordContinuous(self.__recordValues)
+
     def clear_lambdas(self) -> None:
         super().clear_lambdas()
         self.__getS = None
@@ -707,7 +749,7 @@ class Process(Station):
 
 class Decide(Station):
     """Station: Decide."""
-    __slots__ = ("__rate", "__rateSum", "__station", "__statisticOptions")
+    __slots__ = ("__rate", "__rateSum", "__rateCumulative", "__station", "__statisticOptions")
 
     def __init__(self, simulator: Simulator) -> None:
         """Station: Decide.
@@ -718,6 +760,7 @@ class Decide(Station):
         super().__init__(simulator)
         self.__rate: list[float] = []
         self.__rateSum: float = 0
+        self.__rateCumulative: list[float] = []
         self.__station: list[Station] = []
         self.__statisticOptions: RecordOptions = RecordOptions()
 
@@ -730,22 +773,16 @@ class Decide(Station):
         """
         self.__rate.append(rate)
         self.__rateSum += rate
+        self.__rateCumulative.append(self.__rateSum)
         self.__station.append(station)
 
     def arrival(self, client: Client) -> None:
         super().arrival(client)
         rnd: float = random.random() * self.__rateSum
-        sum: float = 0
-        optionCount: int = len(self.__rate)
-        for i in range(0, optionCount):
-            sum += self.__rate[i]
-            if sum >= rnd:
-                client.send_to(self.__station[i])
-                self.__statisticOptions.record(i + 1)
-                return
-
-        client.send_to(self.__station[optionCount - 1])
-        self.__statisticOptions.record(optionCount)
+        # First option whose cumulative rate is >= rnd (binary search instead of summing up the rates for each client)
+        i: int = min(bisect_left(self.__rateCumulative, rnd), len(self.__rateCumulative) - 1)
+        client.send_to(self.__station[i])
+        self.__statisticOptions.record(i + 1)
 
     @property
     def statistic_options(self) -> RecordOptions:
@@ -765,6 +802,10 @@ class Decide(Station):
         """
         return self.__station
 
+    def reset(self) -> None:
+        super().reset()
+        self.__statisticOptions = RecordOptions()
+
     def clear_lambdas(self) -> None:
         super().clear_lambdas()
         self.__station.clear()
@@ -802,7 +843,7 @@ class DecideCondition(Station):
 
     def arrival(self, client: Client) -> None:
         super().arrival(client)
-        if isinstance(self.__get_nr, str): self.__get_nr = eval(self.__get_nr)
+        if isinstance(self.__get_nr, str): self.__get_nr = _eval_lambda(self.__get_nr)
         nr: int = self.__get_nr()
         client.send_to(self.__station[nr])
         self.__statisticOptions.record(nr + 1)
@@ -825,6 +866,10 @@ class DecideCondition(Station):
         """
         return self.__station
 
+    def reset(self) -> None:
+        super().reset()
+        self.__statisticOptions = RecordOptions()
+
     def clear_lambdas(self) -> None:
         super().clear_lambdas()
         self.__get_nr = None
@@ -890,7 +935,7 @@ class DecideClientType(Station):
 
 class Delay(Station):
     """Station: Delay."""
-    __slots__ = ("__getDelay", "__wip", "__statisticStationResidence", "__statisticWIP", "__nextStation")
+    __slots__ = ("__getDelay", "__wip", "__statisticStationResidence", "__statisticWIP", "__recordValues", "__nextStation")
 
     def __init__(self, simulator: Simulator, getDelay: Any, record_values: bool = False) -> None:
         """Station: Delay.
@@ -905,6 +950,7 @@ class Delay(Station):
         self.__wip: int = 0
         self.__statisticStationResidence: RecordDiscrete = RecordDiscrete()
         self.__statisticWIP: RecordContinuous = RecordContinuous(record_values)
+        self.__recordValues: bool = record_values
         self.__nextStation = None
 
     def set_next(self, station: Station) -> None:
@@ -925,7 +971,7 @@ class Delay(Station):
     def arrival(self, client: Client) -> None:
         super().arrival(client)
         self.__wip += 1
-        if isinstance(self.__getDelay, str): self.__getDelay = eval(self.__getDelay)
+        if isinstance(self.__getDelay, str): self.__getDelay = _eval_lambda(self.__getDelay)
         delay = max(0, self.__getDelay()) if self.__getDelay is not None else 0
         self.__statisticStationResidence.record(delay)
         self.generate_event(delay, client)
@@ -964,6 +1010,12 @@ class Delay(Station):
         if self.__nextStation is None: return []
         return [self.__nextStation]
 
+    def reset(self) -> None:
+        super().reset()
+        self.__wip = 0
+        self.__statisticStationResidence = RecordDiscrete()
+        self.__statisticWIP = RecordContinuous(self.__recordValues)
+
     def clear_lambdas(self) -> None:
         super().clear_lambdas()
         self.__getDelay = None
@@ -3,7 +3,7 @@
 from typing import Any, Optional
 from math import sqrt
 import collections
-import numpy as np  # Comment out this line for use with PyPy
+from ._compat import np, USE_NUMPY
 
 
 __title__ = "queuesim"
@@ -45,16 +45,20 @@ class RecordDiscrete:
         self.__sum2: float = 0
         self.__min: float = 0
         self.__max: float = 0
-        try:
+        if USE_NUMPY:
             self.__cache = np.zeros(discrete_record_np_cache_size)
             self.__cacheSize = len(self.__cache)
-        except NameError:
+        else:
             self.__cache = []
             self.__cacheSize = 0
         self.__cacheUsed = 0
-        self.__histogram: list[float] = []
+        self.__histogram = []
         if discrete_record_histogram_steps > 0:
-            self.__histogram = [0 for i in range(discrete_record_histogram_steps)]
+            if self.__cacheSize > 0:
+                # Counted in NumPy array (in chunks when processing the cache)
+                self.__histogram = np.zeros(discrete_record_histogram_steps, dtype=np.int64)
+            else:
+                self.__histogram = [0 for i in range(discrete_record_histogram_steps)]
             self.__histogram_stepwide = 1
         else:
             self.__histogram_stepwide = -1
@@ -70,20 +74,36 @@ class RecordDiscrete:
             cache = self.__cache[:self.__cacheUsed]
 
         # Process min/max first
+        # (Results are converted to Python floats, so the statistics do not continue with NumPy scalar objects)
         if self.__count == 0:
-            self.__min = np.min(cache)
-            self.__max = np.max(cache)
+            self.__min = float(np.min(cache))
+            self.__max = float(np.max(cache))
         else:
-            self.__min = min(self.__min, np.min(cache))
-            self.__max = max(self.__min, np.max(cache))
+            self.__min = min(self.__min, float(np.min(cache)))
+            self.__max = max(self.__max, float(np.max(cache)))
 
         self.__count += len(cache)
-        self.__sum += np.sum(cache)
-        self.__sum2 += np.sum(np.power(cache, 2))
+        self.__sum += float(np.sum(cache))
+        self.__sum2 += float(np.dot(cache, cache))
+
+        # Frequency distribution
+        if discrete_record_histogram_steps > 0: self.__record_histogram(cache)
 
         # Reset cache usage
         self.__cacheUsed = 0
 
+    def __record_histogram(self, values: Any) -> None:
+        # Histogram update for an array of values (the histogram is a NumPy array in this case)
+        indices = np.maximum(0, np.rint(values).astype(np.int64)) // self.__histogram_stepwide
+        b: int = len(self.__histogram)
+        a: int = int(b / 2)
+        while np.max(indices) >= b:
+            self.__histogram[:a] = self.__histogram[0:2 * a:2] + self.__histogram[1:2 * a:2]
+            self.__histogram[a:] = 0
+            self.__histogram_stepwide *= 2
+            indices //= 2
+        self.__histogram += np.bincount(indices, minlength=b)
+
     def record(self, value: float) -> None:
         """Captures a single measured value.
 
@@ -107,6 +127,7 @@ class RecordDiscrete:
             if self.__cacheUsed == self.__cacheSize: self.__process_cache()
             self.__cache[self.__cacheUsed] = value
             self.__cacheUsed += 1
+            return  # Histogram will be updated when processing the cache
 
         if discrete_record_histogram_steps > 0:
             index: int = round(value) // self.__histogram_stepwide
@@ -119,6 +140,38 @@ class RecordDiscrete:
                 index = int(index / 2)
             self.__histogram[index] += 1
 
+    def record_batch(self, values: Any) -> None:
+        """Captures multiple measured values at once.
+
+        Args:
+            values (Any): NumPy array (or list) of new measured values
+        """
+        global discrete_record_histogram_steps
+
+        if self.__cacheSize == 0:
+            # No NumPy available
+            for value in values: self.record(value)
+            return
+
+        values = np.asarray(values, dtype=np.float64)
+        if len(values) == 0: return
+
+        # Min/max, sums
+        self.__process_cache()
+        value_min: float = float(np.min(values))
+        value_max: float = float(np.max(values))
+        if self.__count == 0:
+            self.__min = value_min
+            self.__max = value_max
+        else:
+            self.__min = min(self.__min, value_min)
+            self.__max = max(self.__max, value_max)
+        self.__count += len(values)
+        self.__sum += float(np.sum(values))
+        self.__sum2 += float(np.dot(values, values))
+
+        if discrete_record_histogram_steps > 0: self.__record_histogram(values)
+
     def done_recording(self) -> None:
         """Terminates caching system before serializing the object.
         (Calling this method is not needed for normal processing.)
@@ -190,12 +243,13 @@ class RecordDiscrete:
         return self.__max
 
     @property
-    def histogram(self) -> list:
+    def histogram(self) -> Any:
         """Frequency distribution of the recorded values
 
         Returns:
-            list[float]: Frequency distribution of the recorded values
+            Any: Frequency distribution of the recorded values (NumPy array of counts, or a list if NumPy is not available)
         """
+        self.__process_cache()
         return self.__histogram
 
     @property
@@ -205,6 +259,7 @@ class RecordDiscrete:
         Returns:
             int: Wide of each entry in the frequency distribution
         """
+        self.__process_cache()
         return self.__histogram_stepwide
 
     def __str__(self) -> str:
@@ -1,11 +1,16 @@
 """Auxiliary functions for the simulation of queueing models."""
 
-from typing import Optional
+from typing import Any, Callable, Optional, Union
 import multiprocessing as mp
+from concurrent.futures import Future, ProcessPoolExecutor
+import os
+import pickle
 from time import perf_counter
 from .descore import Simulator
 from .stations import Station
 from .models import get_simulator_from_model
+from . import random_dist
+from ._compat import np, USE_NUMPY
 
 
 __title__ = "queuesim"
@@ -30,39 +35,116 @@ limitations under the License.
 __license__ = "Apache 2.0"
 
 
-def _run_sim_process(model: dict, queue: mp.Queue) -> None:
+def _build_model(model: Union[dict, Callable], args: tuple) -> dict:
+    # Models can also be passed as factory functions, which are called inside the worker process
+    return model(*args) if callable(model) else model
+
+
+def _run_sim(model: Union[dict, Callable], args: tuple = ()) -> dict:
+    model = _build_model(model, args)
     simulator = get_simulator_from_model(model)
     simulator.run()
 
     for station in model.values():
         if isinstance(station, Station): station.clear_lambdas()
-    queue.put(model)
+    return model
+
+
+def _run_sim_pickled(data: bytes, args: tuple) -> dict:
+    return _run_sim(pickle.loads(data), args)
+
+
+def _run_sim_process(model: Union[dict, Callable], args: tuple, queue: mp.SimpleQueue) -> None:
+    _worker_init()
+    queue.put(_run_sim(model, args))
+
+
+def _get_column(model: dict, column: Any) -> Any:
+    if callable(column): return column(model)
+    path: list = column.split(".")
+    value: Any = model[path[0]]
+    for name in path[1:]: value = getattr(value, name)
+    return value
+
+
+def _run_sim_columns(model: Union[dict, Callable], args: tuple, columns: list) -> tuple:
+    model = _build_model(model, args)
+    get_simulator_from_model(model).run()
+    return tuple(_get_column(model, column) for column in columns)
+
+
+def _worker_init() -> None:
+    # Each worker process gets its own random number streams (independent of the start method)
+    random_dist.seed()
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_pool(workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """Returns the process pool used by run_parallel.
+    The pool is created on the first call and then reused, so the worker processes only have to be started once per script.
+
+    Args:
+        workers (Optional[int], optional): Number of worker processes (only used when the pool is created). Defaults to None (number of CPU cores).
+
+    Returns:
+        ProcessPoolExecutor: Process pool
+    """
+    global _pool
+    if _pool is None: _pool = ProcessPoolExecutor(workers or os.cpu_count(), initializer=_worker_init)
+    return _pool
 
 
 class SimProcess:
     """This class encapsulates a complete simulation process."""
 
-    def __init__(self, model: dict):
+    def __init__(self, model: Union[dict, Callable], *args):
         """This class encapsulates a complete simulation process.
 
         Args:
-            model (dict): Stations of the model
+            model (Union[dict, Callable]): Stations of the model or a model factory function (like queuesim.models.mmc_model), which will be called inside the simulation process (this requires a picklable, i.e. module level, function)
+            args: Arguments for the model factory function
         """
-        self.__queue: mp.Queue = mp.Queue()
-        self.__process: mp.Process = mp.Process(target=_run_sim_process, args=(model, self.__queue, ))
+        self.__model: Union[dict, Callable] = model
+        self.__args: tuple = args
+        self.__queue: Optional[mp.SimpleQueue] = None
+        self.__process: Optional[mp.Process] = None
+        self.__future: Optional[Future] = None
         self.__simulator: Optional[Simulator] = None
         self.__results: Optional[dict] = None
 
     def start(self) -> None:
         """Starts the process.
         """
+        self.__queue = mp.SimpleQueue()  # No feeder thread per process (unlike mp.Queue)
+        self.__process = mp.Process(target=_run_sim_process, args=(self.__model, self.__args, self.__queue, ))
         self.__process.start()
 
+    def submit(self, pool: ProcessPoolExecutor) -> None:
+        """Runs the simulation in a worker process of a process pool (instead of starting an own process).
+        If the model cannot be pickled (e.g. because it contains lambda expressions generated with as_lambda=True), an own process is started instead (see start).
+
+        Args:
+            pool (ProcessPoolExecutor): Process pool (see get_pool)
+        """
+        try:
+            data: bytes = pickle.dumps(self.__model)
+        except (pickle.PicklingError, AttributeError, TypeError):
+            self.start()  # Under the "fork" start method the new process inherits the model without pickling it
+            return
+        self.__future = pool.submit(_run_sim_pickled, data, self.__args)
+
     def join(self) -> None:
         """Waits for the simulation to complete."""
-        self.__process.join()
+        if self.__future is not None:
+            self.__results = self.__future.result()
+        elif self.__process is not None and self.__queue is not None:
+            self.__results = self.__queue.get()  # Get results before joining, otherwise a large model can block the queue
+            self.__process.join()
+        else:
+            return
 
-        self.__results = self.__queue.get()
         self.__simulator = get_simulator_from_model(self.__results)
 
     @property
@@ -88,16 +170,21 @@ class SimProcess:
 
 def run_parallel(processes: list) -> tuple:
     """Starts the processes, waits for their termination and collects the results.
+    The simulations are executed in the worker processes of the shared process pool (see get_pool).
+    For this the models are pickled. Models which cannot be pickled (because they contain lambda expressions, e.g. distributions generated with as_lambda=True or conditions and priorities given as lambdas instead of strings) are simulated in own processes instead. This only works with the "fork" start method of multiprocessing (the default on Linux); on other platforms such models have to use strings instead of lambda expressions.
 
     Args:
-        processes (list[SimProcess]): List of simulation processes to be started
+        processes (list[Union[SimProcess, tuple]]): List of simulation processes to be started. Instead of a SimProcess object a tuple (model factory function, tuple of arguments) can be passed; then the model is built inside the worker process.
 
     Returns:
         tuple[list[dict], list[Simulator]]: Tuple of lists of models and of simulators
     """
     start = perf_counter()
 
-    for process in processes: process.start()
+    processes = [process if isinstance(process, SimProcess) else SimProcess(process[0], *process[1]) for process in processes]
+
+    pool = get_pool()
+    for process in processes: process.submit(pool)
     print(len(processes), "parallel processes started.")
 
     for process in processes: process.join()
@@ -110,6 +197,34 @@ def run_parallel(processes: list) -> tuple:
     return (models, simulators)
 
 
+def run_parallel_columns(models: list, columns: Union[dict, list]) -> dict:
+    """Simulates the models in the shared process pool (see get_pool) and only collects selected scalar results.
+    Instead of transferring the complete models back to the main process, only one value per column and model is returned.
+    The models have to be picklable, i.e. they must not contain lambda expressions (use strings instead, see run_parallel).
+
+    Args:
+        models (list[Union[dict, tuple]]): List of models to be simulated. Instead of a model a tuple (model factory function, tuple of arguments) can be passed; then the model is built inside the worker process.
+        columns (Union[dict, list]): Columns to be collected. Each column is either a path like "meanS" or "Dispose.statistic_client_waiting.mean" (model key followed by attribute names) or a picklable (module level) function taking the model and returning the value. If a dict is passed, the keys are used as column names; otherwise the paths are used as names.
+
+    Returns:
+        dict[str, np.ndarray]: Result values per column (one value per model)
+    """
+    if not isinstance(columns, dict): columns = {column: column for column in columns}
+    start = perf_counter()
+
+    pool = get_pool()
+    models = [(model, ()) if isinstance(model, dict) else model for model in models]
+    futures: list = [pool.submit(_run_sim_columns, model, args, list(columns.values())) for model, args in models]
+    print(len(futures), "parallel processes started.")
+
+    rows: list = [future.result() for future in futures]
+    print("All processes terminated, runtime:", round(perf_counter() - start, 1), "seconds.")
+
+    if USE_NUMPY:
+        return {name: np.fromiter((row[i] for row in rows), dtype=np.float64, count=len(rows)) for i, name in enumerate(columns)}
+    return {name: [row[i] for row in rows] for i, name in enumerate(columns)}
+
+
 def get_multi_run_info(sources: list, simulators: list, lang: Optional[str] = None) -> str:
     """Outputs information about the total runtime over several models.
 
@@ -121,19 +236,23 @@ def get_multi_run_info(sources: list, simulators: list, lang: Optional[str] = No
     Returns:
         str: Total runtime information
     """
-    runTimeAll: float = max(simulator.run_time for simulator in simulators)
-    runTimeSum: float = sum(simulator.run_time for simulator in simulators)
+    runTimeAll: float = 0
+    runTimeSum: float = 0
+    for simulator in simulators:
+        runTime: float = simulator.run_time
+        runTimeSum += runTime
+        if runTime > runTimeAll: runTimeAll = runTime
     arrivalCount: int = sum(source.count for source in sources)
     results: list = []
 
     if not isinstance(lang, str) or lang.lower() != "de":
-        results.append("Models: " + str(len(simulators)))
-        results.append("Client arrivals (total): " + str(round(arrivalCount / 1000 / 1000, 1)) + " millons")
-        results.append("Computing time (total): " + str(round(runTimeAll, 1)) + " Sekunden")
-        results.append("Computing time per client (real): " + str(round(runTimeSum / arrivalCount * 1000 * 1000, 1)) + " µs")
+        results.append(f"Models: {len(simulators)}")
+        results.append(f"Client arrivals (total): {round(arrivalCount / 1000 / 1000, 1)} millons")
+        results.append(f"Computing time (total): {round(runTimeAll, 1)} Sekunden")
+        results.append(f"Computing time per client (real): {round(runTimeSum / arrivalCount * 1000 * 1000, 1)} µs")
     else:
-        results.append("Modelle: " + str(len(simulators)))
-        results.append("Kundenankünfte (gesamt): " + str(round(arrivalCount / 1000 / 1000, 1)) + " Mio.")
-        results.append("Rechenzeit (gesamt): " + str(round(runTimeAll, 1)) + " Sekunden")
-        results.append("Rechenzeit pro Kunde (real): " + str(round(runTimeSum / arrivalCount * 1000 * 1000, 1)) + " µs")
+        results.append(f"Modelle: {len(simulators)}")
+        results.append(f"Kundenankünfte (gesamt): {round(arrivalCount / 1000 / 1000, 1)} Mio.")
+        results.append(f"Rechenzeit (gesamt): {round(runTimeAll, 1)} Sekunden")
+        results.append(f"Rechenzeit pro Kunde (real): {round(runTimeSum / arrivalCount * 1000 * 1000, 1)} µs")
     return "\n".join(results)